@@ -4,6 +4,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
 from scipy.ndimage import gaussian_filter
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
@@ -58,6 +59,36 @@ class HeatmapGenerator:
 
         print(f"✓ Heatmap generado: {output_path}")
 
+    def generate_from_array(
+        self,
+        points: np.ndarray,
+        output_path: Path,
+        blur_radius: int = 20
+    ):
+        """
+        Genera heatmap a partir de un array de coordenadas (N, 2) [x, y]
+
+        Equivalente a generate_from_events pero sin iterar eventos en Python
+        (ver Database.get_mouse_points_array).
+
+        Args:
+            points: Array (N, 2) de coordenadas x, y
+            output_path: Ruta donde guardar la imagen
+            blur_radius: Radio del gaussian blur (más alto = más suave)
+        """
+        if len(points) == 0:
+            print("⚠️  No hay eventos para generar heatmap")
+            return
+
+        self._save_heatmap_image(
+            heatmap=self._accumulate(points),
+            output_path=output_path,
+            blur_radius=blur_radius,
+            title=f"Heatmap - {len(points)} eventos"
+        )
+
+        print(f"✓ Heatmap generado: {output_path}")
+
     def generate_click_heatmap(
         self,
         events: List[Dict[str, Any]],
@@ -85,6 +116,22 @@ class HeatmapGenerator:
 
         print(f"✓ Click heatmap generado: {output_path}")
 
+    def _accumulate(self, points: np.ndarray) -> np.ndarray:
+        """Cuenta eventos por pixel: array (N, 2) [x, y] → matriz (alto, ancho)"""
+        points = np.asarray(points).reshape(-1, 2)
+        width, height = self.screen_width, self.screen_height
+
+        # Asegurar que las coordenadas están dentro de los límites (el cast trunca
+        # igual que los bins de 1 px de histogram2d, ya sin negativos)
+        xs = np.clip(points[:, 0], 0, width - 1).astype(np.intp)
+        ys = np.clip(points[:, 1], 0, height - 1).astype(np.intp)
+
+        # Índice plano y * ancho + x: un solo bincount en vez de histogram2d
+        flat = ys * width
+        flat += xs
+        counts = np.bincount(flat, minlength=width * height)
+        return counts.reshape(height, width).astype(np.float64)
+
     def _generate_heatmap_image(
         self,
         coordinates: List[Tuple[int, int]],
@@ -93,16 +140,21 @@ class HeatmapGenerator:
         title: str
     ):
         """Genera la imagen del heatmap"""
-        # Crear matriz 2D para acumular eventos
-        heatmap = np.zeros((self.screen_height, self.screen_width))
-
-        # Acumular eventos en la matriz
-        for x, y in coordinates:
-            # Asegurar que las coordenadas están dentro de los límites
-            x = max(0, min(x, self.screen_width - 1))
-            y = max(0, min(y, self.screen_height - 1))
-            heatmap[y, x] += 1
+        self._save_heatmap_image(
+            heatmap=self._accumulate(coordinates),
+            output_path=output_path,
+            blur_radius=blur_radius,
+            title=title
+        )
 
+    def _save_heatmap_image(
+        self,
+        heatmap: np.ndarray,
+        output_path: Path,
+        blur_radius: int,
+        title: str
+    ):
+        """Suaviza, colorea y guarda una matriz de conteos como imagen"""
         # Aplicar gaussian blur para suavizar
         heatmap_blurred = gaussian_filter(heatmap, sigma=blur_radius)
 
@@ -115,8 +167,10 @@ class HeatmapGenerator:
         n_bins = 100
         cmap = LinearSegmentedColormap.from_list('heatmap', colors, N=n_bins)
 
-        # Crear figura
-        fig, ax = plt.subplots(figsize=(16, 9), dpi=100)
+        # Crear figura: Figure directa (render Agg) y no pyplot, que guarda estado
+        # global y no es seguro fuera del hilo principal
+        fig = Figure(figsize=(16, 9), dpi=100)
+        ax = fig.subplots()
 
         # Plot heatmap
         im = ax.imshow(
@@ -135,7 +189,7 @@ class HeatmapGenerator:
         ax.set_title(title, fontsize=14, fontweight='bold')
 
         # Añadir colorbar
-        cbar = plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+        cbar = fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
         cbar.set_label('Intensidad de interacción', rotation=270, labelpad=20)
 
         # Grid
@@ -143,9 +197,8 @@ class HeatmapGenerator:
 
         # Guardar
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(output_path, dpi=150, bbox_inches='tight')
 
     def generate_comparison(
         self,
@@ -229,12 +282,7 @@ class HeatmapGenerator:
         blur_radius: int
     ) -> np.ndarray:
         """Crea array 2D del heatmap"""
-        heatmap = np.zeros((self.screen_height, self.screen_width))
-
-        for x, y in coordinates:
-            x = max(0, min(x, self.screen_width - 1))
-            y = max(0, min(y, self.screen_height - 1))
-            heatmap[y, x] += 1
+        heatmap = self._accumulate(coordinates)
 
         heatmap_blurred = gaussian_filter(heatmap, sigma=blur_radius)
 
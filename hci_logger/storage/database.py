@@ -1,15 +1,85 @@
 # -*- coding: utf-8 -*-
 """Database manager for HCI Logger"""
 
+import logging
 import sqlite3
 import time
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Integer codes for mouse_events.event_type in NumPy arrays (the column stays TEXT)
+MOUSE_MOVE, MOUSE_CLICK, MOUSE_SCROLL = 0, 1, 2
+
+# One record per mouse event, column-friendly (see Database.get_mouse_events_array)
+MOUSE_EVENT_DTYPE = np.dtype([
+    ('x', '<i4'),
+    ('y', '<i4'),
+    ('event_type', 'u1'),
+    ('pressed', '?'),
+    ('ts', '<f8'),
+])
+
+# Integer codes for emotion_events.dominant_emotion (index into EMOTION_LABELS);
+# anything else (NULL, unexpected labels) maps to the trailing 'unknown'
+EMOTION_LABELS = (
+    'angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral', 'unknown',
+)
+
+EMOTION_EVENT_DTYPE = np.dtype([
+    ('dominant', 'u1'),
+    ('task_id', '<i4'),
+    ('ts', '<f8'),
+])
+
+
+@dataclass
+class ReportBundle:
+    """All rows needed by the post-session report, read in one transaction"""
+    mouse_events: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=MOUSE_EVENT_DTYPE)
+    )
+    screenshots: list = field(default_factory=list)
+    audio_segments: list = field(default_factory=list)
+    transcriptions: list = field(default_factory=list)
+    emotion_events: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=EMOTION_EVENT_DTYPE)
+    )
+
 
 class Database:
     """Simple SQLite database manager"""
 
+    # Per-connection tuning applied on connect (journal_mode is persistent in the file)
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",     # 256 MB
+        "PRAGMA cache_size=-65536",       # 64 MB
+        "PRAGMA busy_timeout=5000",
+        "PRAGMA wal_autocheckpoint=1000",
+    )
+
+    # Fixed SQL text: sqlite3's statement cache reuses the prepared statement
+    _SQL_INSERT_MOUSE = """
+        INSERT INTO mouse_events
+        (session_id, timestamp, event_type, x, y, button, pressed, scroll_dx, scroll_dy)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _SQL_INSERT_MOUSE_TASK = """
+        INSERT INTO mouse_events
+        (session_id, timestamp, event_type, x, y, button, pressed,
+         scroll_dx, scroll_dy, task_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def __init__(self, db_path: Path = None):
         if db_path is None:
             db_path = Path(__file__).parent.parent.parent / "data" / "hci_logger.db"
@@ -18,16 +88,26 @@ class Database:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn: Optional[sqlite3.Connection] = None
 
-    def connect(self):
-        """Connect to database"""
+    def connect(self, read_only: bool = False):
+        """Connect to database (read_only=True rejects writes, e.g. for report readers)"""
         # check_same_thread=False permite usar la conexión desde múltiples threads
         # Esto es seguro porque ya usamos WAL mode que soporta concurrencia
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row  # Access columns by name
 
-        # Enable WAL mode for better concurrency
-        self.conn.execute("PRAGMA journal_mode=WAL")
-        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # WAL + relaxed sync for concurrency; page cache and mmap for large reads
+        for pragma in self.PRAGMAS:
+            self.conn.execute(pragma)
+        # journal_mode reports the mode actually in effect; some filesystems
+        # (e.g. network shares) silently keep the rollback journal
+        mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if mode.lower() != "wal":
+            logger.warning(
+                "SQLite WAL not available for %s (journal_mode=%s); "
+                "writes will block readers", self.db_path, mode
+            )
+        if read_only:
+            self.conn.execute("PRAGMA query_only=ON")
 
         return self.conn
 
@@ -60,6 +140,24 @@ class Database:
 
         print(f"✓ Database initialized at {self.db_path}")
 
+    def _executemany_in_transaction(self, sql: str, rows: list):
+        """Run executemany inside one explicit write transaction (one commit per batch)
+
+        If the caller already has a transaction open, the rows join it and the
+        caller stays responsible for committing or rolling back.
+        """
+        own_txn = not self.conn.in_transaction
+        if own_txn:
+            self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(sql, rows)
+        except Exception:
+            if own_txn:
+                self.conn.rollback()
+            raise
+        if own_txn:
+            self.conn.commit()
+
     def create_session(
         self,
         session_uuid: str,
@@ -118,32 +216,17 @@ class Database:
         )
 
     def insert_mouse_events_batch(self, events: list):
-        """Insert multiple mouse events in batch.
+        """Insert multiple mouse events in a single transaction.
 
         Accepts tuples of 9 elements (legacy) or 10 elements (with task_id).
         """
         if not events:
             return
         if len(events[0]) == 10:
-            self.conn.executemany(
-                """
-                INSERT INTO mouse_events
-                (session_id, timestamp, event_type, x, y, button, pressed,
-                 scroll_dx, scroll_dy, task_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                events
-            )
+            sql = self._SQL_INSERT_MOUSE_TASK
         else:
-            self.conn.executemany(
-                """
-                INSERT INTO mouse_events
-                (session_id, timestamp, event_type, x, y, button, pressed, scroll_dx, scroll_dy)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                events
-            )
-        self.conn.commit()
+            sql = self._SQL_INSERT_MOUSE
+        self._executemany_in_transaction(sql, events)
 
     def get_session(self, session_id: int) -> Optional[Dict[str, Any]]:
         """Get session by ID"""
@@ -166,6 +249,43 @@ class Database:
         )
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_mouse_events_array(self, session_id: int) -> np.ndarray:
+        """Get a session's mouse events as a MOUSE_EVENT_DTYPE structured array"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = None  # plain tuples feed np.fromiter directly
+        cursor.execute(
+            """
+            SELECT x, y,
+                   CASE event_type WHEN 'move' THEN ? WHEN 'click' THEN ? ELSE ? END,
+                   COALESCE(pressed, 0),
+                   timestamp
+            FROM mouse_events
+            WHERE session_id = ?
+            ORDER BY timestamp
+            """,
+            (MOUSE_MOVE, MOUSE_CLICK, MOUSE_SCROLL, session_id)
+        )
+        return np.fromiter(cursor, dtype=MOUSE_EVENT_DTYPE)
+
+    def get_mouse_points_array(
+        self,
+        session_id: int,
+        event_types: tuple = ('move', 'click')
+    ) -> np.ndarray:
+        """Get (x, y) of a session's mouse events as an int32 array of shape (N, 2)"""
+        placeholders = ", ".join("?" * len(event_types))
+        cursor = self.conn.cursor()
+        cursor.row_factory = None  # plain tuples: no sqlite3.Row per event
+        cursor.execute(
+            f"""
+            SELECT x, y FROM mouse_events
+            WHERE session_id = ? AND event_type IN ({placeholders})
+            """,
+            (session_id, *event_types)
+        )
+        flat = np.fromiter(chain.from_iterable(cursor), dtype=np.int32)
+        return flat.reshape(-1, 2)
+
     def get_event_count(self, session_id: int) -> int:
         """Get total event count for session"""
         cursor = self.conn.execute(
@@ -202,6 +322,23 @@ class Database:
         )
         self.conn.commit()
 
+    def insert_screenshots_batch(self, screenshots: list):
+        """Insert multiple screenshot records in a single transaction.
+
+        Accepts tuples of 12 elements, in the same column order as insert_screenshot.
+        """
+        if not screenshots:
+            return
+        self._executemany_in_transaction(
+            """
+            INSERT INTO screenshots
+            (session_id, timestamp, file_path, file_size, width, height, format,
+             trigger_event_type, trigger_x, trigger_y, trigger_metadata, task_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            screenshots
+        )
+
     def get_screenshots(self, session_id: int) -> list:
         """Get all screenshots for a session"""
         cursor = self.conn.execute(
@@ -247,6 +384,23 @@ class Database:
         )
         self.conn.commit()
 
+    def insert_audio_segments_batch(self, segments: list):
+        """Insert multiple audio segment records in a single transaction.
+
+        Accepts tuples of 9 elements, in the same column order as insert_audio_segment.
+        """
+        if not segments:
+            return
+        self._executemany_in_transaction(
+            """
+            INSERT INTO audio_segments
+            (session_id, start_timestamp, end_timestamp, duration,
+             file_path, sample_rate, channels, file_size, task_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            segments
+        )
+
     def get_audio_segments(self, session_id: int) -> list:
         """Get all audio segments for a session"""
         cursor = self.conn.execute(
@@ -306,6 +460,23 @@ class Database:
         )
         self.conn.commit()
 
+    def insert_emotion_events_batch(self, events: list):
+        """Insert multiple emotion events in a single transaction.
+
+        Accepts tuples of 14 elements, in the same column order as insert_emotion_event.
+        """
+        if not events:
+            return
+        self._executemany_in_transaction(
+            """
+            INSERT INTO emotion_events
+            (session_id, timestamp, angry, disgust, fear, happy, sad, surprise, neutral,
+             dominant_emotion, face_confidence, age, gender, task_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            events
+        )
+
     def get_emotion_events(self, session_id: int) -> list:
         """Get all emotion events for a session"""
         cursor = self.conn.execute(
@@ -318,6 +489,28 @@ class Database:
         )
         return [dict(row) for row in cursor.fetchall()]
 
+    # CASE dominant_emotion WHEN 'angry' THEN 0 ... ELSE <unknown> END
+    _SQL_EMOTION_CODE = "CASE dominant_emotion {} ELSE {} END".format(
+        " ".join(f"WHEN '{label}' THEN {code}"
+                 for code, label in enumerate(EMOTION_LABELS[:-1])),
+        len(EMOTION_LABELS) - 1,
+    )
+
+    def get_emotion_events_array(self, session_id: int) -> np.ndarray:
+        """Get a session's emotion events as an EMOTION_EVENT_DTYPE structured array"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = None  # plain tuples feed np.fromiter directly
+        cursor.execute(
+            f"""
+            SELECT {self._SQL_EMOTION_CODE}, COALESCE(task_id, 0), timestamp
+            FROM emotion_events
+            WHERE session_id = ?
+            ORDER BY timestamp
+            """,
+            (session_id,)
+        )
+        return np.fromiter(cursor, dtype=EMOTION_EVENT_DTYPE)
+
     def get_emotion_event_count(self, session_id: int) -> int:
         """Get total emotion event count for session"""
         cursor = self.conn.execute(
@@ -423,6 +616,23 @@ class Database:
         )
         return [dict(row) for row in cursor.fetchall()]
 
+    def load_report_bundle(self, session_id: int) -> ReportBundle:
+        """Load every report query for a session inside a single read transaction"""
+        own_txn = not self.conn.in_transaction
+        if own_txn:
+            self.conn.execute("BEGIN")
+        try:
+            return ReportBundle(
+                mouse_events=self.get_mouse_events_array(session_id),
+                screenshots=self.get_screenshots(session_id),
+                audio_segments=self.get_audio_segments(session_id),
+                transcriptions=self.get_transcriptions(session_id),
+                emotion_events=self.get_emotion_events_array(session_id),
+            )
+        finally:
+            if own_txn:
+                self.conn.commit()
+
     def close(self):
         """Close database connection"""
         if self.conn:
@@ -38,7 +38,9 @@ CREATE TABLE IF NOT EXISTS mouse_events (
     FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_mouse_session ON mouse_events(session_id);
+-- (session_id, timestamp): per-session reads come back already ordered, no sort step
+DROP INDEX IF EXISTS idx_mouse_session;
+CREATE INDEX IF NOT EXISTS idx_mouse_session_ts ON mouse_events(session_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_mouse_timestamp ON mouse_events(timestamp);
 CREATE INDEX IF NOT EXISTS idx_mouse_type ON mouse_events(event_type);
 
@@ -61,7 +63,8 @@ CREATE TABLE IF NOT EXISTS screenshots (
     FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_screenshot_session ON screenshots(session_id);
+DROP INDEX IF EXISTS idx_screenshot_session;
+CREATE INDEX IF NOT EXISTS idx_screenshot_session_ts ON screenshots(session_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_screenshot_timestamp ON screenshots(timestamp);
 CREATE INDEX IF NOT EXISTS idx_screenshot_trigger_type ON screenshots(trigger_event_type);
 
@@ -103,7 +106,8 @@ CREATE TABLE IF NOT EXISTS emotion_events (
     FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_emotion_session ON emotion_events(session_id);
+DROP INDEX IF EXISTS idx_emotion_session;
+CREATE INDEX IF NOT EXISTS idx_emotion_session_ts ON emotion_events(session_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_emotion_timestamp ON emotion_events(timestamp);
 CREATE INDEX IF NOT EXISTS idx_emotion_dominant ON emotion_events(dominant_emotion);
 
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""Escritor de base de datos en un hilo dedicado"""
+
+import logging
+import time
+from queue import Queue, Empty, Full
+from threading import Thread
+from typing import Optional
+
+from .database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseWriter:
+    """
+    Drena una cola de filas hacia SQLite desde un único hilo
+
+    Los callbacks de los trackers solo hacen ``put()`` y retornan de inmediato.
+    El hilo agrupa las filas por tabla y las confirma en lotes (una transacción
+    por lote) cuando una tabla acumula ``batch_size`` filas o cuando la fila
+    pendiente más antigua lleva ``flush_interval`` segundos esperando (aunque
+    sigan llegando datos de otras tablas).
+
+    El hilo abre su propia conexión SQLite al mismo archivo: las escrituras no
+    comparten conexión (ni transacción) con las lecturas/escrituras de la UI.
+
+    Si un lote falla se reintenta fila por fila, así una fila inválida no
+    arrastra al resto; las filas que no se pudieron escribir se cuentan en
+    ``failed_rows``. Si la conexión no se puede abrir el error queda en
+    ``error``; ``put()`` descarta (y lo registra una vez) y ``stop()`` lo reporta.
+
+    La cola está acotada a ``max_pending`` lotes: si la DB se atasca (p.ej. un
+    fsync lento) ``put()`` nunca bloquea al tracker; descarta el lote más viejo,
+    lo cuenta en ``failed_rows`` y lo registra una vez por atasco.
+    """
+
+    def __init__(self, db: Database, batch_size: int = 200, flush_interval: float = 0.05,
+                 max_pending: int = 2000):
+        """
+        Args:
+            db: Base de datos donde escribir (solo se usa su ``db_path``)
+            batch_size: Filas acumuladas por tabla que fuerzan un commit
+            flush_interval: Espera máxima (s) de una fila pendiente antes de escribirse
+            max_pending: Lotes en cola a partir de los cuales se descarta el más viejo
+        """
+        self.db_path = db.db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: Queue = Queue(maxsize=max_pending)
+        self._overflowing = False
+        self._thread: Optional[Thread] = None
+        self._inserters: dict = {}
+
+        self.error: Optional[BaseException] = None   # fallo al abrir la conexión
+        self.failed_rows = 0                          # filas perdidas (fallidas o descartadas)
+
+    def start(self):
+        """Iniciar el hilo escritor"""
+        self._thread = Thread(
+            target=self._writer_loop,
+            daemon=True,
+            name="DatabaseWriter"
+        )
+        self._thread.start()
+
+    def put(self, table: str, rows: list):
+        """Encolar filas (lista de tuplas) para una tabla ('mouse', 'screenshot', 'audio', 'emotion')"""
+        if self.error is not None:
+            # El hilo ya terminó: encolar solo haría crecer la cola sin consumidor
+            if not self.failed_rows:
+                logger.error(f"DatabaseWriter sin conexión ({self.error}); se descartan filas")
+            self.failed_rows += len(rows)
+            return
+        dropped = False
+        while True:
+            try:
+                self._queue.put_nowait((table, rows))
+                if not dropped:
+                    self._overflowing = False   # hubo lugar: terminó el atasco
+                return
+            except Full:
+                self._drop_oldest()
+                dropped = True
+
+    def _drop_oldest(self):
+        """Cola llena: descartar el lote más viejo en vez de bloquear al productor"""
+        try:
+            item = self._queue.get_nowait()
+        except Empty:
+            return   # el hilo escritor liberó espacio mientras tanto
+        if item is None:
+            self._queue.put_nowait(None)   # nunca descartar el sentinel
+            return
+        if not self._overflowing:
+            logger.warning(
+                f"Cola del DatabaseWriter llena ({self._queue.maxsize} lotes); "
+                f"descartando los lotes más viejos"
+            )
+            self._overflowing = True
+        self.failed_rows += len(item[1])
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """
+        Escribir todo lo pendiente y detener el hilo
+
+        Las filas perdidas (conexión fallida o filas rechazadas) se registran
+        aquí y quedan en ``failed_rows`` / ``error`` para quien llama.
+
+        Returns:
+            False si el hilo no terminó dentro de ``timeout`` (la sesión en la
+            DB puede estar incompleta todavía); True en otro caso
+        """
+        if self._thread is None:
+            return True
+        self._queue.put(None)  # sentinel
+        self._thread.join(timeout=timeout)
+        finished = not self._thread.is_alive()
+        if not finished:
+            logger.error(
+                f"DatabaseWriter no terminó en {timeout:.1f}s "
+                f"(~{self._queue.qsize()} lotes aún en cola)"
+            )
+        self._thread = None
+        if self.error is not None:
+            logger.error(f"DatabaseWriter no escribió la sesión: {self.error}")
+        if self.failed_rows:
+            logger.error(f"DatabaseWriter: {self.failed_rows} filas no se escribieron")
+        return finished
+
+    def _writer_loop(self):
+        """Abrir la conexión del hilo y escribir hasta recibir el sentinel"""
+        db = Database(self.db_path)
+        try:
+            db.connect()
+        except Exception as e:
+            # Registrar el fallo: put()/stop() lo reportan en vez de perder filas en silencio
+            logger.error(f"DatabaseWriter no pudo abrir {self.db_path}: {e}")
+            self.error = e
+            self.failed_rows += sum(len(item[1]) for item in self._drain_queue())
+            return
+        # Tabla lógica → método batch de Database (tuplas en orden de columnas)
+        self._inserters = {
+            'mouse': db.insert_mouse_events_batch,
+            'screenshot': db.insert_screenshots_batch,
+            'audio': db.insert_audio_segments_batch,
+            'emotion': db.insert_emotion_events_batch,
+        }
+        try:
+            self._drain()
+        finally:
+            db.close()
+
+    def _drain(self):
+        """Loop que agrupa filas por tabla y las escribe en lotes"""
+        pending = {}
+        deadline = None   # momento en que la fila pendiente más antigua debe escribirse
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = ()   # venció el plazo sin datos nuevos
+
+            if item is None:
+                break
+
+            if item:
+                table, rows = item
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                table_rows = pending.setdefault(table, [])
+                table_rows.extend(rows)
+                if len(table_rows) >= self.batch_size:
+                    self._flush({table: pending.pop(table)})
+                    if not pending:
+                        deadline = None
+
+            # Plazo medido desde la fila más antigua, no desde el último dato:
+            # el tráfico continuo de mouse no retrasa emociones/capturas
+            if deadline is not None and time.monotonic() >= deadline:
+                self._flush(pending)
+                deadline = None
+
+        self._flush(pending)
+
+    def _flush(self, pending: dict):
+        """Escribir (y vaciar) las filas pendientes de cada tabla"""
+        for table, rows in pending.items():
+            if not rows:
+                continue
+            try:
+                self._inserters[table](rows)
+            except Exception as e:
+                # El lote se revirtió entero: reintentar fila por fila para
+                # conservar las válidas y contar solo las que fallan
+                logger.error(f"Error escribiendo {len(rows)} filas en '{table}': {e}; reintentando por fila")
+                self._flush_rows(table, rows)
+        pending.clear()
+
+    def _flush_rows(self, table: str, rows: list):
+        """Escribir filas una a una (una transacción cada una) tras fallar el lote"""
+        insert = self._inserters[table]
+        failed = 0
+        for row in rows:
+            try:
+                insert([row])
+            except Exception as e:
+                if not failed:
+                    logger.error(f"Fila descartada en '{table}': {row!r} ({e})")
+                failed += 1
+        if failed:
+            self.failed_rows += failed
+            logger.error(f"{failed}/{len(rows)} filas descartadas en '{table}'")
+
+    def _drain_queue(self):
+        """Vaciar la cola sin escribir (conexión no disponible); omite el sentinel"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                return
+            if item:
+                yield item
@@ -1,7 +1,6 @@
 """Audio tracker usando sounddevice"""
 
 import time
-import numpy as np
 import sounddevice as sd
 import soundfile as sf
 from pathlib import Path
@@ -120,10 +119,9 @@ class AudioTracker:
         # Verificar si completamos un segmento
         elapsed = time.time() - self.segment_start_time
         if elapsed >= self.segment_duration:
-            # Enviar segmento al queue de escritura
-            segment_data = np.concatenate(self.current_segment, axis=0)
+            # Enviar segmento al queue de escritura (los bloques tal cual, sin concatenar)
             self.audio_buffer.put({
-                'data': segment_data,
+                'chunks': self.current_segment,
                 'start_time': self.segment_start_time,
                 'end_time': time.time()
             })
@@ -142,7 +140,7 @@ class AudioTracker:
 
                     # Guardar segmento
                     self._save_segment(
-                        audio_data=segment_info['data'],
+                        audio_chunks=segment_info['chunks'],
                         start_time=segment_info['start_time'],
                         end_time=segment_info['end_time']
                     )
@@ -153,8 +151,8 @@ class AudioTracker:
                 if self.running:  # Solo log si no estamos cerrando
                     logger.error(f"Error in writer loop: {e}")
 
-    def _save_segment(self, audio_data: np.ndarray, start_time: float, end_time: float):
-        """Guardar un segmento de audio a archivo"""
+    def _save_segment(self, audio_chunks: list, start_time: float, end_time: float):
+        """Guardar un segmento de audio a archivo, bloque a bloque"""
         try:
             duration = end_time - start_time
 
@@ -162,13 +160,17 @@ class AudioTracker:
             filename = f"audio_{self.session_id}_{int(start_time)}.wav"
             file_path = self.output_dir / filename
 
-            # Guardar usando soundfile
-            sf.write(
+            # Guardar usando soundfile: escribir cada bloque del callback en
+            # streaming evita np.concatenate (una segunda copia de toda la sesión)
+            with sf.SoundFile(
                 file_path,
-                audio_data,
-                self.sample_rate,
+                mode='w',
+                samplerate=self.sample_rate,
+                channels=self.channels,
                 subtype='PCM_16'  # 16-bit PCM
-            )
+            ) as f:
+                for chunk in audio_chunks:
+                    f.write(chunk)
 
             # Obtener tamaño del archivo
             file_size = file_path.stat().st_size
@@ -206,9 +208,8 @@ class AudioTracker:
         # 2. Encolar segmento final ANTES de señalar parada,
         #    así el writer_loop no puede salir antes de procesarlo
         if self.current_segment:
-            segment_data = np.concatenate(self.current_segment, axis=0)
             self.audio_buffer.put({
-                'data': segment_data,
+                'chunks': self.current_segment,
                 'start_time': self.segment_start_time,
                 'end_time': time.time()
             })
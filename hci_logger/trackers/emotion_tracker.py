@@ -2,6 +2,7 @@
 
 import time
 import cv2
+import numpy as np
 from deepface import DeepFace
 from pathlib import Path
 from typing import Optional, Callable, Dict, Any
@@ -11,6 +12,19 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def normalize_emotion(value) -> float:
+    """Normaliza y clampea valor de emoción (0-100 de DeepFace) a rango [0, 1]"""
+    try:
+        if value is None:
+            return 0.0
+        v = float(value) / 100.0
+    except (ValueError, TypeError):
+        return 0.0
+    # Clampear al rango [0, 1] para cumplir con CHECK constraint
+    # (una comparación encadenada en el caso normal, sin llamar a min/max)
+    return v if 0.0 <= v <= 1.0 else (0.0 if v < 0.0 else 1.0)
+
+
 class EmotionTracker:
     """Detecta emociones faciales usando DeepFace"""
 
@@ -24,7 +38,8 @@ class EmotionTracker:
         sample_rate: float = 2.0,
         camera_id: int = 0,
         detector_backend: str = 'opencv',
-        analyze_attributes: bool = True
+        analyze_attributes: bool = True,
+        frame_diff_threshold: float = 5.0
     ):
         """
         Args:
@@ -34,6 +49,9 @@ class EmotionTracker:
             camera_id: ID de la cámara (0 = default)
             detector_backend: Backend de detección ('opencv', 'ssd', 'mtcnn', 'retinaface')
             analyze_attributes: Si analizar edad y género además de emociones
+            frame_diff_threshold: Diferencia media por pixel (0-255, frame 32x32) bajo
+                la cual se reutiliza el último resultado sin llamar a DeepFace
+                (0 = desactivado)
         """
         self.session_id = session_id
         self.on_emotion_callback = on_emotion_callback
@@ -42,6 +60,7 @@ class EmotionTracker:
         self.camera_id = camera_id
         self.detector_backend = detector_backend
         self.analyze_attributes = analyze_attributes
+        self.frame_diff_threshold = frame_diff_threshold
 
         self.cap: Optional[cv2.VideoCapture] = None
         self.running = False
@@ -55,6 +74,11 @@ class EmotionTracker:
         self.models_loaded = False
         self.last_detection_time = 0
 
+        # Cache difuso: miniatura del último frame analizado + su resultado
+        self._last_small: Optional[np.ndarray] = None
+        self._last_result: Optional[Dict[str, Any]] = None
+        self.cache_hits = 0
+
     def start(self):
         """Iniciar detección de emociones"""
         print(f"😊 Emotion tracker starting...")
@@ -74,7 +98,19 @@ class EmotionTracker:
         print(f"   Cámara inicializada: {int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x"
               f"{int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}")
 
-        # Warm up DeepFace (descargar modelos en primera ejecución)
+        self.running = True
+        print(f"✓ Emotion tracker started")
+
+        # Iniciar thread de captura (carga los modelos antes del primer frame)
+        self._thread = Thread(
+            target=self._capture_loop,
+            daemon=True,
+            name="EmotionTracker"
+        )
+        self._thread.start()
+
+    def _warmup_models(self):
+        """Warm up DeepFace (descargar/cargar modelos) desde el thread de captura"""
         print(f"   Cargando modelos de DeepFace (puede tomar un momento)...")
         try:
             ret, frame = self.cap.read()
@@ -96,19 +132,20 @@ class EmotionTracker:
         except Exception as e:
             print(f"⚠️  Advertencia durante warmup: {e}")
 
-        self.running = True
-        print(f"✓ Emotion tracker started")
-
-        # Iniciar thread de captura
-        self._thread = Thread(
-            target=self._capture_loop,
-            daemon=True,
-            name="EmotionTracker"
-        )
-        self._thread.start()
-
     def _capture_loop(self):
         """Loop principal de captura de emociones"""
+        try:
+            # La carga de modelos tarda segundos: se hace aquí y no en start(),
+            # que se llama desde el thread de la UI
+            self._warmup_models()
+            self._run_loop()
+        finally:
+            # Si stop() venció su timeout con este thread ocupado (p.ej. dentro
+            # de DeepFace), la cámara se libera aquí al terminar
+            self._release_camera()
+
+    def _run_loop(self):
+        """Capturar y analizar frames hasta que se pida detener"""
         while self.running and not self._stop_event.is_set():
             try:
                 # Control de sample rate
@@ -147,11 +184,35 @@ class EmotionTracker:
                     print(f"  ⚠️  Error en emotion detection: {e}")
                 time.sleep(1.0)  # Backoff en caso de error
 
+    def _reuse_last_result(self, small, timestamp: float) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve el último resultado (con nuevo timestamp) si la miniatura apenas
+        cambió respecto al último frame analizado por DeepFace; None si hay que
+        volver a analizar. La referencia no se mueve con los aciertos de caché,
+        así una deriva lenta acaba superando el umbral.
+        """
+        last_small = self._last_small
+        if self._last_result is None or last_small is None or self.frame_diff_threshold <= 0:
+            return None
+
+        diff = np.mean(np.abs(small.astype(np.int16) - last_small.astype(np.int16)))
+        if diff >= self.frame_diff_threshold:
+            return None
+
+        self.cache_hits += 1
+        return {**self._last_result, 'timestamp': timestamp}
+
     def _analyze_frame(self, frame) -> Optional[Dict[str, Any]]:
         """Analizar un frame para detectar emociones"""
         try:
             timestamp = time.time()
 
+            # Escena casi estática → reutilizar el último resultado
+            small = cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA)
+            cached = self._reuse_last_result(small, timestamp)
+            if cached is not None:
+                return cached
+
             # Configurar acciones a analizar
             actions = ['emotion']
             if self.analyze_attributes:
@@ -166,8 +227,12 @@ class EmotionTracker:
                 silent=True
             )
 
+            # Nueva referencia de la caché: el frame que DeepFace sí analizó
+            self._last_small = small
+
             # DeepFace puede retornar lista o dict
             if not results:
+                self._last_result = None
                 return None
 
             result = results[0] if isinstance(results, list) else results
@@ -175,32 +240,17 @@ class EmotionTracker:
             # Extraer emociones
             emotions = result.get('emotion', {})
             if not emotions:
+                self._last_result = None
                 return None
 
-            # Normalizar valores a 0-1 y asegurar que estén en el rango válido
-            def normalize_emotion(value):
-                """Normaliza y clampea valor de emoción a rango [0, 1]"""
-                try:
-                    if value is None:
-                        return 0.0
-                    normalized = float(value) / 100.0
-                    # Clampear al rango [0, 1] para cumplir con CHECK constraint
-                    return max(0.0, min(1.0, normalized))
-                except (ValueError, TypeError):
-                    return 0.0
-
             emotion_data = {
                 'session_id': self.session_id,
                 'timestamp': timestamp,
-                'angry': normalize_emotion(emotions.get('angry', 0)),
-                'disgust': normalize_emotion(emotions.get('disgust', 0)),
-                'fear': normalize_emotion(emotions.get('fear', 0)),
-                'happy': normalize_emotion(emotions.get('happy', 0)),
-                'sad': normalize_emotion(emotions.get('sad', 0)),
-                'surprise': normalize_emotion(emotions.get('surprise', 0)),
-                'neutral': normalize_emotion(emotions.get('neutral', 0)),
                 'dominant_emotion': result.get('dominant_emotion', 'unknown')
             }
+            # Normalizar valores a 0-1 y asegurar que estén en el rango válido
+            for name in self.EMOTIONS:
+                emotion_data[name] = normalize_emotion(emotions.get(name, 0))
 
             # Añadir atributos opcionales
             if self.analyze_attributes:
@@ -213,9 +263,12 @@ class EmotionTracker:
                 emotion_data['age'] = None
                 emotion_data['gender'] = None
 
+            self._last_result = emotion_data
             return emotion_data
 
         except Exception as e:
+            # Sin resultado válido: no seguir repitiendo una emoción vieja
+            self._last_result = None
             logger.error(f"Error analizando frame: {e}")
             # Solo loggear en debug, no mostrar en consola para no saturar
             logger.debug(f"  Frame analysis error details: {type(e).__name__}: {e}")
@@ -230,13 +283,23 @@ class EmotionTracker:
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=timeout)
 
-        # Liberar cámara
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        if self._thread and self._thread.is_alive():
+            # No liberar la cámara bajo un cap.read()/analyze en curso:
+            # el thread la libera al salir del loop
+            logger.warning(
+                f"Emotion thread no terminó en {timeout:.1f}s; la cámara se liberará al terminar"
+            )
+        else:
+            self._release_camera()
 
         print(f"✓ Emotion tracker stopped ({self.emotions_captured} emotions captured)")
 
+    def _release_camera(self):
+        """Liberar la cámara una sola vez (la llaman stop() o el thread de captura)"""
+        cap, self.cap = self.cap, None
+        if cap is not None:
+            cap.release()
+
     def get_stats(self):
         """Obtener estadísticas del tracker"""
         return {
@@ -244,6 +307,7 @@ class EmotionTracker:
             'sample_rate': self.sample_rate,
             'detector_backend': self.detector_backend,
             'analyze_attributes': self.analyze_attributes,
+            'cache_hits': self.cache_hits,
             'running': self.running
         }
 
@@ -261,14 +325,16 @@ class EmotionTrackerAsync:
         on_emotion_callback: Callable,
         sample_rate: float = 2.0,
         camera_id: int = 0,
-        detector_backend: str = 'opencv'
+        detector_backend: str = 'opencv',
+        frame_diff_threshold: float = 5.0
     ):
         self.tracker = EmotionTracker(
             session_id=session_id,
             on_emotion_callback=on_emotion_callback,
             sample_rate=sample_rate,
             camera_id=camera_id,
-            detector_backend=detector_backend
+            detector_backend=detector_backend,
+            frame_diff_threshold=frame_diff_threshold
         )
 
     def start(self):
@@ -5,6 +5,7 @@ import time
 import mss
 from pathlib import Path
 from typing import Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import threading
 
@@ -65,6 +66,9 @@ class EventBasedScreenshotTracker:
         # Thread lock para evitar race conditions
         self.lock = threading.Lock()
 
+        # Un único worker codifica/guarda los PNG en orden, fuera del listener de mouse
+        self._save_pool: Optional[ThreadPoolExecutor] = None
+
         # Crear directorio de output
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -77,6 +81,7 @@ class EventBasedScreenshotTracker:
         print(f"   Format: {self.format}")
 
         self.running = True
+        self._save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
 
         # Obtener info del monitor
         with mss.mss() as sct:
@@ -131,20 +136,22 @@ class EventBasedScreenshotTracker:
             self.scroll_accumulator_y += abs(dy)
 
             total_scroll = abs(self.scroll_accumulator_x) + abs(self.scroll_accumulator_y)
-
-            if total_scroll >= self.scroll_threshold:
-                # Reset acumulador
-                self.scroll_accumulator_x = 0
-                self.scroll_accumulator_y = 0
-
-                # Capturar screenshot
-                self._capture_on_event(
-                    event_type='scroll',
-                    x=x,
-                    y=y,
-                    scroll_amount=int(total_scroll),
-                    reason=f"scroll_{int(total_scroll)}px"
-                )
+            if total_scroll < self.scroll_threshold:
+                return
+
+            # Reset acumulador
+            self.scroll_accumulator_x = 0
+            self.scroll_accumulator_y = 0
+
+        # Capturar screenshot fuera del lock: _capture_on_event lo vuelve a tomar
+        # (threading.Lock no es reentrante)
+        self._capture_on_event(
+            event_type='scroll',
+            x=x,
+            y=y,
+            scroll_amount=int(total_scroll),
+            reason=f"scroll_{int(total_scroll)}px"
+        )
 
     def _capture_on_event(self, event_type: str, x: int, y: int, **metadata):
         """
@@ -165,8 +172,8 @@ class EventBasedScreenshotTracker:
 
             self.last_screenshot_time = current_time
 
-        # Capturar screenshot
-        success = self._capture_screenshot(
+        # Capturar screenshot (el guardado y el log ocurren en el worker)
+        self._capture_screenshot(
             timestamp=current_time,
             trigger_event_type=event_type,
             trigger_x=x,
@@ -174,11 +181,6 @@ class EventBasedScreenshotTracker:
             metadata=metadata
         )
 
-        if success:
-            # Log visual
-            reason = metadata.get('reason', event_type)
-            print(f"  📸 Screenshot #{self.screenshots_captured} - Trigger: {reason} @ ({x}, {y})")
-
     def _capture_screenshot(
         self,
         timestamp: float,
@@ -188,7 +190,7 @@ class EventBasedScreenshotTracker:
         metadata: dict
     ) -> bool:
         """
-        Captura el screenshot
+        Captura el screenshot y encola su codificación/guardado
 
         Args:
             timestamp: Timestamp del evento
@@ -205,12 +207,34 @@ class EventBasedScreenshotTracker:
             with mss.mss() as sct:
                 screenshot = sct.grab(sct.monitors[self.monitor])
 
-                # Convertir a PIL Image
-                img = Image.frombytes(
-                    'RGB',
-                    screenshot.size,
-                    screenshot.rgb
-                )
+            # PNG con optimize=True tarda cientos de ms: se hace en el worker
+            self._save_pool.submit(
+                self._save_screenshot, screenshot, timestamp,
+                trigger_event_type, trigger_x, trigger_y, metadata
+            )
+            return True
+
+        except Exception as e:
+            print(f"❌ Error capturing screenshot: {e}")
+            return False
+
+    def _save_screenshot(
+        self,
+        screenshot,
+        timestamp: float,
+        trigger_event_type: str,
+        trigger_x: int,
+        trigger_y: int,
+        metadata: dict
+    ):
+        """Convierte, guarda y notifica un screenshot (corre en el worker de guardado)"""
+        try:
+            # Convertir a PIL Image
+            img = Image.frombytes(
+                'RGB',
+                screenshot.size,
+                screenshot.rgb
+            )
 
             # Generar nombre de archivo
             filename = f"screenshot_{self.session_id}_{int(timestamp)}_{trigger_event_type}.{self.format}"
@@ -244,15 +268,21 @@ class EventBasedScreenshotTracker:
             })
 
             self.screenshots_captured += 1
-            return True
+
+            # Log visual
+            reason = metadata.get('reason', trigger_event_type)
+            print(f"  📸 Screenshot #{self.screenshots_captured} - Trigger: {reason} "
+                  f"@ ({trigger_x}, {trigger_y})")
 
         except Exception as e:
-            print(f"❌ Error capturing screenshot: {e}")
-            return False
+            print(f"❌ Error saving screenshot: {e}")
 
     def stop(self):
-        """Detener el tracker"""
+        """Detener el tracker (espera a que se guarden los screenshots pendientes)"""
         self.running = False
+        if self._save_pool:
+            self._save_pool.shutdown(wait=True)
+            self._save_pool = None
         print(f"✓ Event-based screenshot tracker stopped ({self.screenshots_captured} screenshots captured)")
 
     def get_stats(self):
@@ -35,11 +35,24 @@ class MouseTracker:
         self.listener.start()
         print(f"✓ Mouse tracker started")
 
-    def stop(self):
-        """Stop listening to mouse events"""
-        if self.listener:
-            self.listener.stop()
-            print(f"✓ Mouse tracker stopped ({self.events_captured} events captured)")
+    def stop(self, timeout: float = 2.0) -> bool:
+        """
+        Stop listening to mouse events
+
+        Returns:
+            False si el hilo del listener sigue vivo tras ``timeout`` (un callback
+            pudo quedar bloqueado); True si terminó
+        """
+        if not self.listener:
+            return True
+        self.listener.stop()
+        # Esperar al hilo del listener, con tope: nunca congelar a quien llama (UI)
+        self.listener.join(timeout)
+        if self.listener.is_alive():
+            print(f"⚠️  Mouse listener no terminó en {timeout:.1f}s")
+            return False
+        print(f"✓ Mouse tracker stopped ({self.events_captured} events captured)")
+        return True
 
     def _on_move(self, x: int, y: int):
         """Handle mouse move event"""
@@ -20,6 +20,7 @@ Uso:
 """
 
 import os
+import re
 import sys
 
 # ── Desactivar accesibilidad de Qt ANTES de importar PySide6 ──────────────────
@@ -37,33 +38,67 @@ os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = (
     "--force-renderer-accessibility=false"
 )
 
+import time
 import uuid
+import logging
+import shutil
+import operator
+import itertools
 import threading
+from functools import lru_cache
+from collections import OrderedDict, deque
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
+from PIL import Image, ImageDraw
+from scipy.ndimage import gaussian_filter
+
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QFrame, QLabel, QPushButton, QLineEdit, QTextEdit,
+    QFrame, QLabel, QPushButton, QLineEdit, QPlainTextEdit,
     QSizePolicy, QDialog, QTabWidget, QScrollArea,
     QGridLayout, QSlider, QFileDialog, QMessageBox,
+    QListView, QStyledItemDelegate,
 )
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebEngineCore import (
     QWebEnginePage, QWebEngineProfile, QWebEngineSettings, QWebEngineScript,
 )
-from PySide6.QtCore import QUrl, Qt, Signal, QObject
-from PySide6.QtGui import QFont, QPixmap
+from PySide6.QtCore import (
+    QUrl, Qt, Signal, QObject, QRunnable, QThreadPool, QEvent, QTimer,
+    QAbstractListModel, QModelIndex, QSize, QRect,
+)
+from PySide6.QtGui import QFont, QPixmap, QImage, QTextCursor, QPainter, QColor
+
+# Multimedia (opcional): sin QtMultimedia el tab de audio no ofrece reproductor
+try:
+    from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+    _HAVE_MULTIMEDIA = True
+except ImportError:
+    _HAVE_MULTIMEDIA = False
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from hci_logger.storage.database import Database
+from hci_logger.storage.database import (
+    Database, ReportBundle, MOUSE_MOVE, MOUSE_CLICK, MOUSE_SCROLL, EMOTION_LABELS,
+)
+from hci_logger.storage.writer import DatabaseWriter
 from hci_logger.trackers.mouse_tracker import MouseTracker
 from hci_logger.trackers.event_screenshot_tracker import EventBasedScreenshotTracker
 from hci_logger.trackers.audio_tracker import AudioTrackerAsync
 from hci_logger.trackers.emotion_tracker import EmotionTrackerAsync
 from hci_logger.processing.heatmap import HeatmapGenerator
 
+# OpenCV (opcional): blur gaussiano separable con SIMD para el overlay
+try:
+    import cv2
+    _HAVE_CV2 = True
+except ImportError:
+    _HAVE_CV2 = False
+
+logger = logging.getLogger(__name__)
+
 # ── Configuración ─────────────────────────────────────────────────────────────
 TARGET_URL = "https://www.facebook.com"
 
@@ -76,6 +111,38 @@ EMOTION_EMOJIS = {
     "fear": "😨", "surprise": "😲", "disgust": "🤢", "neutral": "😐",
 }
 
+# Extractores de filas para el writer (orden = columnas de la tabla, sin task_id)
+_mouse_row = operator.itemgetter(
+    "session_id", "timestamp", "event_type", "x", "y",
+    "button", "pressed", "scroll_dx", "scroll_dy",
+)
+_audio_row = operator.itemgetter(
+    "session_id", "start_timestamp", "end_timestamp", "duration",
+    "file_path", "sample_rate", "channels", "file_size",
+)
+_emotion_row = operator.itemgetter(
+    "session_id", "timestamp",
+    "angry", "disgust", "fear", "happy", "sad", "surprise", "neutral",
+    "dominant_emotion", "face_confidence", "age", "gender",
+)
+
+
+# ── Colormap del overlay ──────────────────────────────────────────────────────
+
+def _build_jet_lut() -> np.ndarray:
+    """LUT (256, 4) uint8 del colormap jet-like: azul → cian → verde → amarillo → rojo."""
+    v = np.arange(256, dtype=np.float32) / 255.0
+    lut = np.empty((256, 4), dtype=np.uint8)
+    lut[:, 0] = (np.clip(v * 2.0, 0, 1) * 255).astype(np.uint8)
+    lut[:, 1] = (np.clip(1.0 - np.abs(v * 2.0 - 1.0), 0, 1) * 255).astype(np.uint8)
+    lut[:, 2] = (np.clip(1.0 - v * 2.0, 0, 1) * 255).astype(np.uint8)
+    lut[:, 3] = (v * 170).astype(np.uint8)
+    return lut
+
+
+# El heatmap reescalado ya es uint8: colorearlo es un único fancy-index
+_JET_LUT = _build_jet_lut()
+
 
 # ── Señales Qt ────────────────────────────────────────────────────────────────
 
@@ -114,14 +181,685 @@ class SilentWebPage(QWebEnginePage):
         return None  # Bloquear popups / ventanas nuevas
 
 
+# Widgets esenciales del render que nunca se ocultan (una sola pasada en C)
+_PRESERVE_RE = re.compile(
+    r"RenderWidget|WebEngineView|QWebEngine|FocusProxy|QtWebEngineCore"
+)
+
+
+@lru_cache(maxsize=None)
+def _is_preserved_class(class_name: str) -> bool:
+    """¿Es `class_name` un widget del render? Las clases se repiten: una búsqueda por clase."""
+    return _PRESERVE_RE.search(class_name) is not None
+
+
+class LogView(QPlainTextEdit):
+    """QPlainTextEdit del log que avisa al volver a mostrarse (vuelca lo pendiente)."""
+
+    shown = Signal()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.shown.emit()
+
+
 class UISignals(QObject):
-    click_count_updated      = Signal(int)
-    screenshot_count_updated = Signal(int)
-    emotion_updated          = Signal(str)
     log_message              = Signal(str)
 
 
+# ── Carga de imágenes en segundo plano ────────────────────────────────────────
+
+class ImageLoaderSignals(QObject):
+    loaded = Signal(QImage)
+
+
+class ScaledImageLoader(QRunnable):
+    """Decodifica y escala una imagen fuera del hilo de la UI.
+
+    El resultado escalado se guarda en ``output/cache`` con una clave basada en
+    mtime + tamaño del archivo original, así las aperturas siguientes solo
+    decodifican el PNG ya reducido. El directorio se limita a ``CACHE_MAX_BYTES``:
+    al agregar una entrada se borran las usadas hace más tiempo (un acierto
+    actualiza el mtime de la entrada).
+    """
+
+    CACHE_DIR       = Path("output") / "cache"
+    CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, path: Path, width: int, parent: QObject = None):
+        super().__init__()
+        self.path   = Path(path)
+        self.width  = width
+        # parent = widget destino: si se destruye, la señal muere con él
+        self.signals = ImageLoaderSignals(parent)
+
+    def _cache_path(self) -> Path:
+        st = self.path.stat()
+        return self.CACHE_DIR / (
+            f"{self.path.stem}_{st.st_mtime_ns}_{st.st_size}_{self.width}.png"
+        )
+
+    def run(self):
+        try:
+            cache = self._cache_path()
+            img = QImage(str(cache)) if cache.exists() else QImage()
+            if not img.isNull():
+                os.utime(cache)   # orden LRU para _trim_cache
+            else:
+                img = QImage(str(self.path)).scaledToWidth(
+                    self.width, Qt.SmoothTransformation
+                )
+                if not img.isNull():
+                    cache.parent.mkdir(parents=True, exist_ok=True)
+                    img.save(str(cache), "PNG")
+                    self._trim_cache()
+            self.signals.loaded.emit(img)
+        except (OSError, RuntimeError):
+            pass  # archivo borrado o diálogo ya cerrado
+
+    @classmethod
+    def _trim_cache(cls):
+        """Borrar las entradas menos usadas hasta quedar bajo CACHE_MAX_BYTES."""
+        entries = []
+        for entry in os.scandir(cls.CACHE_DIR):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue   # la borró otro loader
+            entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= cls.CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+class ReportLoaderSignals(QObject):
+    loaded = Signal(int, object)     # (session_id, ReportBundle)
+
+
+class ReportLoader(QRunnable):
+    """Carga los datos del reporte de una sesión fuera del hilo de la UI.
+
+    Usa su propia conexión SQLite (en WAL las lecturas no bloquean al resto).
+    """
+
+    def __init__(self, db_path: Path, session_id: int, parent: QObject = None):
+        super().__init__()
+        self.db_path    = db_path
+        self.session_id = session_id
+        self.signals    = ReportLoaderSignals(parent)
+
+    def run(self):
+        db = Database(self.db_path)
+        try:
+            db.connect(read_only=True)
+            bundle = db.load_report_bundle(self.session_id)
+        except Exception as e:
+            logger.error("Error cargando el reporte de la sesión %s: %s", self.session_id, e)
+            return
+        finally:
+            db.close()
+        try:
+            self.signals.loaded.emit(self.session_id, bundle)
+        except RuntimeError:
+            pass  # ventana ya cerrada
+
+
+class HeatmapWorkerSignals(QObject):
+    done = Signal(int, object)       # (session_id, ruta del PNG o None)
+
+
+class HeatmapWorker(QRunnable):
+    """Genera el PNG del heatmap de una sesión fuera del hilo de la UI.
+
+    Lee los puntos con su propia conexión SQLite de solo lectura.
+    """
+
+    def __init__(self, db_path: Path, session_id: int, output_path: Path,
+                 parent: QObject = None):
+        super().__init__()
+        self.db_path     = db_path
+        self.session_id  = session_id
+        self.output_path = output_path
+        self.signals     = HeatmapWorkerSignals(parent)
+
+    def run(self):
+        result = None
+        db = Database(self.db_path)
+        try:
+            db.connect(read_only=True)
+            points = db.get_mouse_points_array(self.session_id)
+            if len(points):
+                gen = HeatmapGenerator(screen_width=1920, screen_height=1080)
+                gen.generate_from_array(points, self.output_path)
+                result = self.output_path
+        except Exception as e:
+            logger.error("Error generando el heatmap de la sesión %s: %s", self.session_id, e)
+        finally:
+            db.close()
+        try:
+            self.signals.done.emit(self.session_id, result)
+        except RuntimeError:
+            pass  # ventana ya cerrada
+
+
+class SessionStarterSignals(QObject):
+    ready = Signal(object)           # None si todo salió bien, o el mensaje de error
+
+
+class SessionStarter(QRunnable):
+    """Ejecuta el trabajo bloqueante del inicio de sesión fuera del hilo de la UI.
+
+    ``start_fn`` abre la DB, crea la sesión y enciende los trackers (cámara y
+    micrófono incluidos); la UI se actualiza al recibir ``ready``.
+    """
+
+    def __init__(self, start_fn, parent: QObject = None):
+        super().__init__()
+        self.start_fn = start_fn
+        self.signals  = SessionStarterSignals(parent)
+
+    def run(self):
+        error = None
+        try:
+            self.start_fn()
+        except Exception as e:
+            logger.exception("Error iniciando la sesión")
+            error = str(e)
+        try:
+            self.signals.ready.emit(error)
+        except RuntimeError:
+            pass  # ventana ya cerrada
+
+
+# ── Overlays y galería de capturas (carga perezosa) ──────────────────────────
+
+@lru_cache(maxsize=4)
+def _load_screenshot_rgba(path_str: str) -> Image.Image:
+    """Captura decodificada a RGBA; volver a verla (scroll, reapertura) no re-decodifica el PNG.
+
+    Solo se lee: ``alpha_composite`` devuelve una imagen nueva. Cada entrada es
+    de resolución completa (~8 MB a 1920×1080): caché corta, y se vacía al
+    empezar otra sesión.
+    """
+    return Image.open(path_str).convert("RGBA")
+
+
+_MARKER_SPRITES: dict[int, Image.Image] = {}
+
+
+def _marker_sprite(r: int) -> Image.Image:
+    """Marcador de click (anillo blanco + círculo rojo + punto) de radio ``r``, dibujado una vez."""
+    sprite = _MARKER_SPRITES.get(r)
+    if sprite is not None:
+        return sprite
+
+    c = r + 3                                   # centro (margen del anillo exterior)
+    sprite = Image.new("RGBA", (2 * c + 1, 2 * c + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    # Anillo blanco exterior (visibilidad)
+    draw.ellipse(
+        [c - r - 3, c - r - 3, c + r + 3, c + r + 3],
+        outline=(255, 255, 255, 200), width=3,
+    )
+    # Círculo rojo semi-transparente
+    draw.ellipse(
+        [c - r, c - r, c + r, c + r],
+        outline=(220, 50, 50, 255),
+        fill=(220, 50, 50, 140),
+        width=2,
+    )
+    # Punto central blanco
+    draw.ellipse(
+        [c - 4, c - 4, c + 4, c + 4],
+        fill=(255, 255, 255, 255),
+    )
+    _MARKER_SPRITES[r] = sprite
+    return sprite
+
+
+class OverlayRenderer:
+    """
+    Genera overlays de heatmap + clicks sobre las capturas de una sesión.
+    Usa PIL + scipy/OpenCV para rapidez, sin necesidad de matplotlib.
+
+    No depende de widgets: ``render()`` es thread-safe y puede llamarse desde
+    varios workers a la vez (la capa del heatmap se calcula una sola vez).
+    """
+
+    # Resolución del acumulador del overlay: se suaviza aquí y luego se reescala
+    HM_W = 480
+    HM_H = 270
+
+    def __init__(self, mouse_events: np.ndarray):
+        # Eventos de mouse como array MOUSE_EVENT_DTYPE (tal como sale de SQLite)
+        self._mouse_np = mouse_events
+        pressed = (mouse_events["event_type"] == MOUSE_CLICK) & mouse_events["pressed"]
+        self._click_points = list(zip(self._mouse_np["x"][pressed].tolist(),
+                                      self._mouse_np["y"][pressed].tolist()))
+
+        # Heatmap de la sesión: compartido por todas las capturas
+        self._heatmap_cache  = {}           # (screen_w, screen_h) → hm normalizado
+        self._overlay_layers = {}           # (screen_w, screen_h, img_w, img_h) → capa RGBA
+        self._overlay_lock   = threading.Lock()
+
+    def _session_heatmap(self, screen_w: int, screen_h: int) -> np.ndarray:
+        """
+        Heatmap de movimientos de la sesión, suavizado y cuantizado a uint8.
+        Es el mismo para todas las capturas: se calcula una vez por resolución.
+        Se acumula directamente a ``HM_W × HM_H`` (el blur es O(W·H·kernel));
+        el reescalado LANCZOS posterior lo lleva al tamaño de cada captura.
+        Cada etapa reutiliza el buffer de la anterior (operaciones ``out=``).
+        """
+        key = (screen_w, screen_h)
+        hm = self._heatmap_cache.get(key)
+        if hm is not None:
+            return hm
+
+        hm_w, hm_h = self.HM_W, self.HM_H
+        mouse_np = self._mouse_np
+        types = mouse_np["event_type"]
+        m     = (types == MOUSE_MOVE) | (types == MOUSE_CLICK)
+        # Índice plano (y * HM_W + x) calculado sobre los mismos dos buffers
+        xs    = mouse_np["x"][m].astype(np.intp)
+        ys    = mouse_np["y"][m].astype(np.intp)
+        np.clip(xs, 0, screen_w - 1, out=xs)
+        np.clip(ys, 0, screen_h - 1, out=ys)
+        xs *= hm_w
+        xs //= screen_w
+        ys *= hm_h
+        ys //= screen_h
+        ys *= hm_w
+        ys += xs
+        hm    = np.bincount(ys, minlength=hm_w * hm_h).astype(np.float32).reshape(hm_h, hm_w)
+
+        # sigma=25 px de pantalla, proporcional a la resolución del acumulador
+        sigma = 25.0 * hm_w / screen_w
+        if _HAVE_CV2:
+            # Mismo borde que scipy ("reflect") para que ambos caminos coincidan
+            cv2.GaussianBlur(hm, ksize=(0, 0), sigmaX=sigma, sigmaY=sigma, dst=hm,
+                             borderType=cv2.BORDER_REFLECT)
+        else:
+            gaussian_filter(hm, sigma=sigma, output=hm)
+        peak = hm.max()
+        if peak > 0:
+            hm /= peak
+        hm *= 255.0
+        hm_u8 = hm.astype(np.uint8)
+
+        self._heatmap_cache[key] = hm_u8
+        return hm_u8
+
+    def _overlay_layer(self, screen_w: int, screen_h: int, img_w: int, img_h: int):
+        """Capa RGBA coloreada del heatmap, cacheada por tamaño de imagen."""
+        key = (screen_w, screen_h, img_w, img_h)
+        # Los workers de la galería piden la capa a la vez: se calcula una sola vez
+        with self._overlay_lock:
+            layer = self._overlay_layers.get(key)
+            if layer is None:
+                layer = self._build_overlay_layer(screen_w, screen_h, img_w, img_h)
+                self._overlay_layers[key] = layer
+        return layer
+
+    def _build_overlay_layer(self, screen_w: int, screen_h: int, img_w: int, img_h: int):
+        """Colorea el heatmap de la sesión reescalado a ``img_w × img_h``."""
+        hm_u8 = self._session_heatmap(screen_w, screen_h)
+
+        # Escalar heatmap al tamaño real del screenshot
+        hm_pil    = Image.fromarray(hm_u8).resize(
+            (img_w, img_h), Image.LANCZOS
+        )
+        hm_rgba   = _JET_LUT[np.asarray(hm_pil)]
+
+        return Image.fromarray(hm_rgba, "RGBA")
+
+    def render(self, screenshot_info: dict):
+        """
+        Genera en memoria un overlay de heatmap + clicks sobre el screenshot.
+        Usa PIL + scipy para rapidez, sin necesidad de matplotlib.
+        La capa del heatmap se comparte entre capturas; por captura solo se
+        compone la imagen y se dibujan los clicks.
+        Se llama desde los workers del pool: devuelve un QImage (no QPixmap,
+        que solo existe en el hilo de la UI) o None si hay error.
+        """
+        try:
+            path = Path(screenshot_info["file_path"])
+            if not path.exists():
+                return None
+
+            img    = _load_screenshot_rgba(str(path))
+            img_w, img_h = img.size
+
+            # Dimensiones lógicas de pantalla (coordenadas de pynput)
+            SCREEN_W = screenshot_info.get("width")  or img_w
+            SCREEN_H = screenshot_info.get("height") or img_h
+
+            overlay_layer = self._overlay_layer(SCREEN_W, SCREEN_H, img_w, img_h)
+            result        = Image.alpha_composite(img, overlay_layer)
+
+            # ── Marcadores de clicks (mismo sprite pegado en cada posición) ───
+            clicks = self._click_points
+            if clicks:
+                sx     = img_w / SCREEN_W
+                sy     = img_h / SCREEN_H
+                r      = max(10, int(16 * min(sx, sy)))
+                sprite = _marker_sprite(r)
+                size   = sprite.width
+                off    = r + 3
+
+                for cx, cy in clicks:
+                    x0 = int(cx * sx) - off
+                    y0 = int(cy * sy) - off
+                    # alpha_composite no acepta destinos negativos: recortar el sprite
+                    src_x, src_y = max(0, -x0), max(0, -y0)
+                    if src_x >= size or src_y >= size or x0 >= img_w or y0 >= img_h:
+                        continue
+                    result.alpha_composite(
+                        sprite, dest=(x0 + src_x, y0 + src_y), source=(src_x, src_y)
+                    )
+
+            # ── Convertir a QImage (bytes RGBA crudos, sin codificar PNG) ──────
+            data = result.tobytes("raw", "RGBA")
+            # .copy(): el QImage no debe referenciar el buffer de Python
+            return QImage(data, result.width, result.height,
+                          result.width * 4, QImage.Format_RGBA8888).copy()
+
+        except Exception as e:
+            print(f"Error generando overlay: {e}")
+            return None
+
+
+class OverlaySignals(QObject):
+    ready = Signal(int, int, QImage)   # generación del OverlayCache, fila, imagen
+
+
+_overlay_generations = itertools.count(1)
+_overlay_signals_instance = None
+
+
+def _overlay_signals() -> OverlaySignals:
+    """Emisor compartido por todos los OverlayWorker, hijo de la QApplication.
+
+    Vive lo mismo que la app: un worker que termina después de descartarse su
+    OverlayCache emite sobre un objeto vivo y el resultado se ignora por generación.
+    """
+    global _overlay_signals_instance
+    if _overlay_signals_instance is None:
+        _overlay_signals_instance = OverlaySignals(QApplication.instance())
+    return _overlay_signals_instance
+
+
+class OverlayWorker(QRunnable):
+    """Genera el overlay de una captura fuera del hilo de la UI (QImage, no QPixmap)."""
+
+    def __init__(self, generation: int, row: int, screenshot: dict, render, size: QSize,
+                 signals: OverlaySignals):
+        super().__init__()
+        self.generation = generation
+        self.row        = row
+        self.screenshot = screenshot
+        self.render     = render     # callable(dict) → QImage | None (thread-safe)
+        self.size       = size
+        self.signals    = signals
+
+    def run(self):
+        img = self.render(self.screenshot)
+        if img is None or img.isNull():
+            img = QImage()
+        else:
+            img = img.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        try:
+            self.signals.ready.emit(self.generation, self.row, img)
+        except RuntimeError:
+            pass  # aplicación cerrándose
+
+
+class OverlayCache(QObject):
+    """
+    Overlays ya escalados (QImage) de las capturas de una sesión, por fila.
+
+    Las filas se generan en el QThreadPool global: ``precompute()`` encola las
+    primeras al finalizar la sesión y la galería pide con ``request()`` las que
+    falten. Se conservan como mucho ``CACHE_SIZE`` (LRU, ~2 MB cada una); una
+    fila descartada se vuelve a generar si se pide otra vez.
+
+    Los workers no referencian al cache: emiten por ``_overlay_signals()`` con la
+    generación del cache que los pidió, y cada cache ignora las ajenas. Así un
+    cache descartado (``discard()``) o destruido con su diálogo no recibe nada.
+    """
+
+    CACHE_SIZE = 32
+
+    ready = Signal(int)
+
+    def __init__(self, screenshots: list, renderer: OverlayRenderer, size: QSize,
+                 parent=None):
+        super().__init__(parent)
+        self._screenshots = screenshots
+        self._renderer    = renderer
+        self._size        = size
+        self._images: OrderedDict[int, QImage] = OrderedDict()
+        self._pending: set[int] = set()
+        self._failed:  set[int] = set()
+        self._generation = next(_overlay_generations)
+        self._signals = _overlay_signals()
+        self._signals.ready.connect(self._on_ready)
+
+    def discard(self):
+        """Dejar de recibir resultados y liberar el cache (los workers en curso terminan solos)."""
+        self._signals.ready.disconnect(self._on_ready)
+        self._generation = 0   # por si ya había un resultado en cola hacia este cache
+        self._images.clear()
+        self.deleteLater()
+
+    def image(self, row: int):
+        img = self._images.get(row)
+        if img is not None:
+            self._images.move_to_end(row)
+        return img
+
+    def failed(self, row: int) -> bool:
+        return row in self._failed
+
+    def request(self, row: int):
+        if row in self._images or row in self._pending or row in self._failed:
+            return
+        self._pending.add(row)
+        QThreadPool.globalInstance().start(OverlayWorker(
+            self._generation, row, self._screenshots[row], self._renderer.render,
+            self._size, self._signals
+        ))
+
+    def precompute(self):
+        """Encolar las primeras capturas (las que la galería muestra al abrirse).
+
+        Más allá de ``CACHE_SIZE`` el LRU las descartaría antes de verse.
+        """
+        pool = QThreadPool.globalInstance()
+        pool.setMaxThreadCount(os.cpu_count() or 1)
+        for row in range(min(len(self._screenshots), self.CACHE_SIZE)):
+            self.request(row)
+
+    def _on_ready(self, generation: int, row: int, img: QImage):
+        if generation != self._generation:
+            return   # de otro cache (o de este, ya descartado)
+        self._pending.discard(row)
+        if img.isNull():
+            self._failed.add(row)
+        else:
+            self._images[row] = img
+            if len(self._images) > self.CACHE_SIZE:
+                self._images.popitem(last=False)
+        self.ready.emit(row)
+
+
+class ScreenshotListModel(QAbstractListModel):
+    """
+    Modelo de la galería: solo pide a ``OverlayCache`` los overlays de las
+    filas que la vista pinta (las visibles). Mantiene un LRU de pixmaps.
+    """
+
+    CACHE_SIZE = OverlayCache.CACHE_SIZE
+
+    def __init__(self, screenshots: list, overlays: OverlayCache, parent=None):
+        super().__init__(parent)
+        self._screenshots = screenshots
+        self._overlays    = overlays
+        self._info        = [self._info_text(i, ss) for i, ss in enumerate(screenshots)]
+        self._pixmaps: OrderedDict[int, QPixmap] = OrderedDict()
+        overlays.ready.connect(self._on_ready)
+
+    @staticmethod
+    def _info_text(i: int, ss: dict) -> str:
+        ts_str      = datetime.fromtimestamp(ss["timestamp"]).strftime("%H:%M:%S")
+        task_str    = f"T{ss.get('task_id', '?')}"
+        trigger_str = ss.get("trigger_event_type", "periodic") or "periodic"
+        pos_str     = f"({ss.get('trigger_x', '?')}, {ss.get('trigger_y', '?')})" \
+                      if ss.get("trigger_x") else ""
+        return f"#{i+1}   [{ts_str}]   {task_str}   trigger: {trigger_str}  {pos_str}"
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._screenshots)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self._info[row]
+        if role == Qt.DecorationRole:
+            pixmap = self._pixmaps.get(row)
+            if pixmap is not None:
+                self._pixmaps.move_to_end(row)
+                return pixmap
+            img = self._overlays.image(row)
+            if img is None:
+                self._overlays.request(row)
+                return None
+            pixmap = QPixmap.fromImage(img)
+            self._pixmaps[row] = pixmap
+            if len(self._pixmaps) > self.CACHE_SIZE:
+                self._pixmaps.popitem(last=False)
+            return pixmap
+        if role == Qt.UserRole:
+            return self._overlays.failed(row)
+        return None
+
+    def _on_ready(self, row: int):
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx)
+
+
+class ScreenshotDelegate(QStyledItemDelegate):
+    """Pinta cada captura como una tarjeta: línea de info + imagen (o aviso)."""
+
+    INFO_H = 22
+    MARGIN = 6
+    GAP    = 10     # separación vertical entre tarjetas
+
+    def __init__(self, size: QSize, parent=None):
+        super().__init__(parent)
+        self._size = size
+        self._font = QFont()
+        self._font.setPointSize(9)
+
+    def sizeHint(self, option, index):
+        m = self.MARGIN
+        return QSize(self._size.width() + 2 * m,
+                     self._size.height() + self.INFO_H + 2 * m + self.GAP)
+
+    def paint(self, painter, option, index):
+        m    = self.MARGIN
+        card = option.rect.adjusted(0, 0, -4, -self.GAP)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#23272a"))
+        painter.drawRoundedRect(card, 6, 6)
+
+        painter.setFont(self._font)
+        painter.setPen(QColor("#72767d"))
+        painter.drawText(
+            QRect(card.left() + m + 2, card.top() + m, card.width() - 2 * m, self.INFO_H),
+            Qt.AlignLeft | Qt.AlignVCenter, index.data(Qt.DisplayRole),
+        )
+
+        img_rect = QRect(card.left() + m, card.top() + m + self.INFO_H,
+                         card.width() - 2 * m, card.height() - 2 * m - self.INFO_H)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            x = img_rect.left() + (img_rect.width() - pixmap.width()) // 2
+            painter.drawPixmap(x, img_rect.top(), pixmap)
+        else:
+            failed = index.data(Qt.UserRole)
+            painter.setPen(QColor("#555"))
+            painter.drawText(
+                img_rect, Qt.AlignCenter,
+                "No se pudo generar la visualización" if failed else "Generando visualización…",
+            )
+        painter.restore()
+
+
 # ── Diálogo de análisis post-sesión ──────────────────────────────────────────
+
+# Hoja de estilos del diálogo de análisis: Qt la parsea una vez y resuelve por
+# selector; cada widget solo fija su objectName (sin setStyleSheet por widget)
+_DIALOG_QSS = """
+* { background: #1e2124; color: #dcddde; }
+QWidget#page, QWidget#page * { background: #2f3136; }
+
+QTabWidget::pane { border: 1px solid #40444b; }
+QTabBar::tab { background: #2f3136; color: #dcddde; padding: 8px 16px; }
+QTabBar::tab:selected { background: #7289da; color: white; }
+QScrollArea, QListView { border: none; }
+
+QLabel#title { font-size: 15px; font-weight: bold; padding: 6px 2px; }
+QLabel#heading { color: #dcddde; font-size: 13px; font-weight: bold; }
+QLabel#muted { color: #72767d; font-size: 13px; }
+QLabel#mutedSmall { color: #72767d; font-size: 11px; }
+QLabel#statValue { color: #ffffff; font-size: 13px; font-weight: bold; }
+QLabel#taskTop { color: #b9ffa0; font-size: 12px; }
+QLabel#fileName { color: #dcddde; font-size: 12px; font-weight: bold; }
+QLabel#position { color: #72767d; font-size: 11px; min-width: 80px; }
+QLabel#error { color: #f04747; font-size: 11px; }
+
+QFrame#card, QFrame#card QLabel { background: #23272a; border-radius: 6px; padding: 6px; }
+
+QPushButton#primary {
+    background: #7289da; color: white; border-radius: 4px;
+    padding: 8px 24px; font-size: 13px;
+}
+QPushButton#primary:hover { background: #677bc4; }
+QPushButton#export {
+    background: #7289da; color: white; border-radius: 6px;
+    font-size: 13px; padding: 0 16px;
+}
+QPushButton#export:hover { background: #677bc4; }
+QPushButton#secondary {
+    background: #4f545c; color: #dcddde; border-radius: 4px;
+    font-size: 12px; padding: 4px 12px;
+}
+QPushButton#secondary:hover { background: #5d6269; }
+QPushButton#play {
+    background: #43b581; color: white; border-radius: 4px;
+    font-size: 12px; padding: 4px 8px;
+}
+QPushButton#play:hover { background: #3ca374; }
+
+QSlider::groove:horizontal { height: 4px; background: #40444b; border-radius: 2px; }
+QSlider::handle:horizontal {
+    width: 12px; height: 12px; margin: -4px 0;
+    background: #7289da; border-radius: 6px;
+}
+QSlider::sub-page:horizontal { background: #7289da; border-radius: 2px; }
+"""
+
+
 class ReportDialog(QDialog):
     """Muestra el análisis de la sesión recién finalizada."""
 
@@ -129,65 +867,78 @@ class ReportDialog(QDialog):
     SCREEN_W = 1920
     SCREEN_H = 1080
 
+    # Tamaño de cada imagen en la galería de capturas
+    GALLERY_SIZE = QSize(980, 980 * SCREEN_H // SCREEN_W)
+
     def __init__(self, session_id: int, session_uuid: str, db: Database,
-                 heatmap_path=None, parent=None):
+                 heatmap_path=None, bundle: ReportBundle = None,
+                 overlays: OverlayCache = None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Análisis de Sesión")
         self.resize(1050, 750)
-        self.setStyleSheet("background: #1e2124; color: #dcddde;")
+        # Una sola hoja de estilos: los widgets solo declaran su objectName
+        self.setStyleSheet(_DIALOG_QSS)
 
         self._heatmap_path = heatmap_path   # ruta exacta del heatmap de esta sesión
-        self._players = []                  # QMediaPlayer refs (evitar GC)
-
-        # Cargar todos los datos una sola vez
-        self._mouse_events   = db.get_mouse_events(session_id)
-        self._screenshots    = db.get_screenshots(session_id)
-        self._audio_segments = db.get_audio_segments(session_id)
-        self._emotions       = db.get_emotion_events(session_id)
+        self._players = []                  # un dict por audio; el QMediaPlayer se crea al dar Play
+
+        # Posición de reproducción: sondeo a 4 Hz en vez de cada positionChanged
+        self._pos_timer = QTimer(self)
+        self._pos_timer.setInterval(250)
+        self._pos_timer.timeout.connect(self._update_positions)
+
+        # Cargar todos los datos una sola vez (una única transacción de lectura),
+        # salvo que la ventana principal ya los haya cargado al finalizar
+        if bundle is None:
+            bundle = db.load_report_bundle(session_id)
+        self._mouse_events   = bundle.mouse_events
+        self._screenshots    = bundle.screenshots
+        self._audio_segments = bundle.audio_segments
+        self._transcriptions = bundle.transcriptions
+        self._emotions       = bundle.emotion_events
+
+        # Overlays de la galería (precalculados al finalizar la sesión si existen)
+        if overlays is None:
+            overlays = OverlayCache(
+                self._screenshots, OverlayRenderer(self._mouse_events),
+                self.GALLERY_SIZE, self,
+            )
+        self._overlays = overlays
 
         layout = QVBoxLayout(self)
         layout.setSpacing(8)
 
         title = QLabel(f"Análisis — Sesión {session_uuid[:8]}…")
-        title.setStyleSheet("font-size: 15px; font-weight: bold; padding: 6px 2px;")
+        title.setObjectName("title")
         layout.addWidget(title)
 
         tabs = QTabWidget()
-        tabs.setStyleSheet(
-            "QTabWidget::pane { border: 1px solid #40444b; }"
-            "QTabBar::tab { background: #2f3136; color: #dcddde; padding: 8px 16px; }"
-            "QTabBar::tab:selected { background: #7289da; color: white; }"
-        )
         layout.addWidget(tabs)
 
-        tabs.addTab(self._build_stats_tab(session_id, db),        "📊 Resumen")
+        tabs.addTab(self._build_stats_tab(),                       "📊 Resumen")
         tabs.addTab(self._build_screenshots_tab(),                 "📸 Capturas")
         tabs.addTab(self._build_heatmap_tab(),                     "🗺 Heatmap General")
         tabs.addTab(self._build_audio_tab(),                       "🎵 Audio")
-        tabs.addTab(self._build_emotions_tab(session_id, db),      "😊 Emociones")
+        tabs.addTab(self._build_emotions_tab(),                    "😊 Emociones")
 
         close_btn = QPushButton("Cerrar")
-        close_btn.setStyleSheet(
-            "QPushButton { background: #7289da; color: white; border-radius: 4px; "
-            "padding: 8px 24px; font-size: 13px; } "
-            "QPushButton:hover { background: #677bc4; }"
-        )
+        close_btn.setObjectName("primary")
         close_btn.clicked.connect(self.accept)
         layout.addWidget(close_btn, alignment=Qt.AlignRight)
 
     # ── Tabs ──────────────────────────────────────────────────────────────────
 
-    def _build_stats_tab(self, session_id: int, db: Database) -> QWidget:
+    def _build_stats_tab(self) -> QWidget:
         w = QWidget()
-        w.setStyleSheet("background: #2f3136;")
+        w.setObjectName("page")
         grid = QGridLayout(w)
         grid.setSpacing(12)
         grid.setContentsMargins(20, 20, 20, 20)
 
-        events = self._mouse_events
-        clicks  = sum(1 for e in events if e["event_type"] == "click" and e["pressed"])
-        moves   = sum(1 for e in events if e["event_type"] == "move")
-        scrolls = sum(1 for e in events if e["event_type"] == "scroll")
+        types   = self._mouse_events["event_type"]
+        clicks  = np.count_nonzero((types == MOUSE_CLICK) & self._mouse_events["pressed"])
+        moves   = np.count_nonzero(types == MOUSE_MOVE)
+        scrolls = np.count_nonzero(types == MOUSE_SCROLL)
         audio_s = sum(s["duration"] for s in self._audio_segments)
 
         stats = [
@@ -202,9 +953,9 @@ class ReportDialog(QDialog):
 
         for row, (label, value) in enumerate(stats):
             lbl = QLabel(label)
-            lbl.setStyleSheet("color: #72767d; font-size: 13px;")
+            lbl.setObjectName("muted")
             val = QLabel(value)
-            val.setStyleSheet("color: #ffffff; font-size: 13px; font-weight: bold;")
+            val.setObjectName("statValue")
             grid.addWidget(lbl, row, 0)
             grid.addWidget(val, row, 1)
 
@@ -214,14 +965,14 @@ class ReportDialog(QDialog):
     def _build_screenshots_tab(self) -> QWidget:
         """Galería de screenshots con heatmap overlay y marcadores de clicks."""
         w = QWidget()
-        w.setStyleSheet("background: #2f3136;")
+        w.setObjectName("page")
         layout = QVBoxLayout(w)
         layout.setContentsMargins(8, 8, 8, 8)
         layout.setSpacing(6)
 
         if not self._screenshots:
             lbl = QLabel("No hay capturas de pantalla en esta sesión.")
-            lbl.setStyleSheet("color: #72767d; font-size: 13px;")
+            lbl.setObjectName("muted")
             lbl.setAlignment(Qt.AlignCenter)
             layout.addWidget(lbl, alignment=Qt.AlignCenter)
             return w
@@ -231,16 +982,12 @@ class ReportDialog(QDialog):
             f"{len(self._screenshots)} capturas  —  "
             f"heatmap de actividad de mouse + círculos rojos = clicks"
         )
-        header.setStyleSheet("color: #72767d; font-size: 11px;")
+        header.setObjectName("mutedSmall")
         top_row.addWidget(header, stretch=1)
 
         exp_btn = QPushButton("📁 Exportar capturas…")
         exp_btn.setFixedHeight(26)
-        exp_btn.setStyleSheet(
-            "QPushButton { background: #4f545c; color: #dcddde; border-radius: 4px; "
-            "font-size: 11px; padding: 0 10px; }"
-            "QPushButton:hover { background: #5d6269; }"
-        )
+        exp_btn.setObjectName("secondary")
         shots = list(self._screenshots)
         exp_btn.clicked.connect(lambda: self._export_files(
             [s["file_path"] for s in shots], "capturas"
@@ -248,65 +995,21 @@ class ReportDialog(QDialog):
         top_row.addWidget(exp_btn)
         layout.addLayout(top_row)
 
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; background: #2f3136; }")
-
-        gallery = QWidget()
-        gallery.setStyleSheet("background: #2f3136;")
-        gallery_layout = QVBoxLayout(gallery)
-        gallery_layout.setSpacing(10)
-        gallery_layout.setContentsMargins(0, 0, 4, 0)
-
-        MAX_W = 980  # ancho máximo de imagen en la galería
-
-        for i, ss in enumerate(self._screenshots):
-            ts_str      = datetime.fromtimestamp(ss["timestamp"]).strftime("%H:%M:%S")
-            task_str    = f"T{ss.get('task_id', '?')}"
-            trigger_str = ss.get("trigger_event_type", "periodic") or "periodic"
-            pos_str     = f"({ss.get('trigger_x', '?')}, {ss.get('trigger_y', '?')})" \
-                          if ss.get("trigger_x") else ""
-
-            card = QFrame()
-            card.setStyleSheet(
-                "QFrame { background: #23272a; border-radius: 6px; padding: 6px; }"
-            )
-            card_v = QVBoxLayout(card)
-            card_v.setSpacing(4)
-
-            # Info row
-            info = QLabel(
-                f"<b style='color:#dcddde'>#{i+1}</b>"
-                f"  <span style='color:#72767d'>[{ts_str}]</span>"
-                f"  <span style='color:#7289da'>{task_str}</span>"
-                f"  <span style='color:#72767d'>trigger: {trigger_str}  {pos_str}</span>"
-            )
-            info.setStyleSheet("font-size: 11px;")
-            card_v.addWidget(info)
-
-            # Overlay image (generated on-the-fly with PIL)
-            pixmap = self._make_overlay_pixmap(ss, self._mouse_events)
-            img_lbl = QLabel()
-            if pixmap and not pixmap.isNull():
-                scaled = pixmap.scaledToWidth(MAX_W, Qt.SmoothTransformation)
-                img_lbl.setPixmap(scaled)
-            else:
-                img_lbl.setText("No se pudo generar la visualización")
-                img_lbl.setStyleSheet("color: #555; font-size: 12px;")
-            img_lbl.setAlignment(Qt.AlignCenter)
-            card_v.addWidget(img_lbl)
-
-            gallery_layout.addWidget(card)
-
-        gallery_layout.addStretch()
-        scroll.setWidget(gallery)
-        layout.addWidget(scroll)
+        # Vista virtualizada: solo se generan los overlays de las filas visibles
+        view = QListView()
+        view.setUniformItemSizes(True)
+        view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        view.setSelectionMode(QListView.NoSelection)
+        view.setFocusPolicy(Qt.NoFocus)
+        view.setModel(ScreenshotListModel(self._screenshots, self._overlays, view))
+        view.setItemDelegate(ScreenshotDelegate(self.GALLERY_SIZE, view))
+        layout.addWidget(view)
         return w
 
     def _build_heatmap_tab(self) -> QWidget:
         """Muestra el heatmap de movimientos y clicks de esta sesión."""
         w = QWidget()
-        w.setStyleSheet("background: #2f3136;")
+        w.setObjectName("page")
         v = QVBoxLayout(w)
         v.setContentsMargins(0, 0, 0, 0)
 
@@ -318,11 +1021,7 @@ class ReportDialog(QDialog):
             export_row.setContentsMargins(8, 8, 8, 4)
             exp_btn = QPushButton("📁 Exportar heatmap…")
             exp_btn.setFixedHeight(30)
-            exp_btn.setStyleSheet(
-                "QPushButton { background: #4f545c; color: #dcddde; border-radius: 4px; "
-                "font-size: 12px; padding: 0 12px; }"
-                "QPushButton:hover { background: #5d6269; }"
-            )
+            exp_btn.setObjectName("secondary")
             exp_btn.clicked.connect(lambda: self._export_files([str(img_path)], "heatmap"))
             export_row.addStretch()
             export_row.addWidget(exp_btn)
@@ -330,16 +1029,21 @@ class ReportDialog(QDialog):
 
             scroll = QScrollArea()
             scroll.setWidgetResizable(True)
-            scroll.setStyleSheet("QScrollArea { border: none; background: #2f3136; }")
-            img_label = QLabel()
-            pixmap = QPixmap(str(img_path))
-            img_label.setPixmap(pixmap.scaledToWidth(1020, Qt.SmoothTransformation))
+            img_label = QLabel("Cargando heatmap…")
+            img_label.setObjectName("muted")
             img_label.setAlignment(Qt.AlignCenter)
             scroll.setWidget(img_label)
             v.addWidget(scroll)
+
+            # Decodificar + escalar en el pool de threads (no bloquea la UI)
+            loader = ScaledImageLoader(img_path, 1020, parent=img_label)
+            loader.signals.loaded.connect(
+                lambda img: img_label.setPixmap(QPixmap.fromImage(img))
+            )
+            QThreadPool.globalInstance().start(loader)
         else:
             info = QLabel("No se encontró heatmap.\n(Se genera al finalizar la sesión.)")
-            info.setStyleSheet("color: #72767d; font-size: 13px;")
+            info.setObjectName("muted")
             info.setAlignment(Qt.AlignCenter)
             v.addWidget(info, alignment=Qt.AlignCenter)
 
@@ -348,133 +1052,103 @@ class ReportDialog(QDialog):
     def _build_audio_tab(self) -> QWidget:
         """Reproductor de audio de la sesión + exportación."""
         w = QWidget()
-        w.setStyleSheet("background: #2f3136;")
+        w.setObjectName("page")
         outer = QVBoxLayout(w)
         outer.setContentsMargins(12, 12, 12, 12)
         outer.setSpacing(10)
 
         if not self._audio_segments:
             lbl = QLabel("No hay audio grabado en esta sesión.")
-            lbl.setStyleSheet("color: #72767d; font-size: 13px;")
+            lbl.setObjectName("muted")
             lbl.setAlignment(Qt.AlignCenter)
             outer.addWidget(lbl, alignment=Qt.AlignCenter)
             return w
 
-        # Importar multimedia (opcional — falla silenciosamente)
-        try:
-            from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-            multimedia_ok = True
-        except ImportError:
-            multimedia_ok = False
-
         for seg in self._audio_segments:
             file_path = Path(seg["file_path"])
             dur_min  = seg["duration"] / 60
             size_kb  = seg["file_size"] / 1024
 
             card = QFrame()
-            card.setStyleSheet(
-                "QFrame { background: #23272a; border-radius: 6px; padding: 6px; }"
-            )
+            card.setObjectName("card")
             card_v = QVBoxLayout(card)
             card_v.setSpacing(6)
 
             # ── Info ──
             info_row = QHBoxLayout()
             fname_lbl = QLabel(file_path.name)
-            fname_lbl.setStyleSheet("color: #dcddde; font-size: 12px; font-weight: bold;")
+            fname_lbl.setObjectName("fileName")
             info_row.addWidget(fname_lbl)
             meta_lbl = QLabel(
                 f"  {dur_min:.1f} min  ·  {size_kb:.0f} KB  ·  {seg['sample_rate']} Hz"
             )
-            meta_lbl.setStyleSheet("color: #72767d; font-size: 11px;")
+            meta_lbl.setObjectName("mutedSmall")
             info_row.addWidget(meta_lbl)
             info_row.addStretch()
             card_v.addLayout(info_row)
 
             # ── Controles de reproducción ──
-            if multimedia_ok and file_path.exists():
-                player = QMediaPlayer()
-                audio_out = QAudioOutput()
-                audio_out.setVolume(1.0)
-                player.setAudioOutput(audio_out)
-                player.setSource(QUrl.fromLocalFile(str(file_path.resolve())))
-                self._players.append((player, audio_out))
+            if _HAVE_MULTIMEDIA and file_path.exists():
+                # Sesiones nuevas guardan rutas absolutas; solo las antiguas necesitan resolve()
+                local = file_path if file_path.is_absolute() else file_path.resolve()
 
                 ctrl_row = QHBoxLayout()
                 ctrl_row.setSpacing(8)
 
                 btn_play = QPushButton("▶ Play")
                 btn_play.setFixedWidth(90)
-                btn_play.setStyleSheet(
-                    "QPushButton { background: #43b581; color: white; border-radius: 4px; "
-                    "font-size: 12px; padding: 4px 8px; }"
-                    "QPushButton:hover { background: #3ca374; }"
-                )
+                btn_play.setObjectName("play")
 
                 btn_stop = QPushButton("⏹ Stop")
                 btn_stop.setFixedWidth(90)
-                btn_stop.setStyleSheet(
-                    "QPushButton { background: #4f545c; color: #dcddde; border-radius: 4px; "
-                    "font-size: 12px; padding: 4px 8px; }"
-                    "QPushButton:hover { background: #5d6269; }"
-                )
+                btn_stop.setObjectName("secondary")
 
                 slider = QSlider(Qt.Horizontal)
                 slider.setRange(0, 0)
-                slider.setStyleSheet(
-                    "QSlider::groove:horizontal { height: 4px; background: #40444b; border-radius: 2px; }"
-                    "QSlider::handle:horizontal { width: 12px; height: 12px; margin: -4px 0; "
-                    "background: #7289da; border-radius: 6px; }"
-                    "QSlider::sub-page:horizontal { background: #7289da; border-radius: 2px; }"
-                )
 
                 pos_lbl = QLabel("0:00 / 0:00")
-                pos_lbl.setStyleSheet("color: #72767d; font-size: 11px; min-width: 80px;")
+                pos_lbl.setObjectName("position")
                 pos_lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
+                entry = {
+                    "path": local, "player": None, "audio_out": None,
+                    "slider": slider, "pos_lbl": pos_lbl,
+                }
+                self._players.append(entry)
+
                 # Closures para conectar señales correctamente por iteración
-                def _make_play_cb(p, btn):
+                def _make_play_cb(e, btn):
                     def cb():
-                        from PySide6.QtMultimedia import QMediaPlayer as _MP
-                        if p.playbackState() == _MP.PlaybackState.PlayingState:
+                        p = self._ensure_player(e)
+                        if p.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
                             p.pause()
                             btn.setText("▶ Play")
                         else:
                             p.play()
                             btn.setText("⏸ Pausa")
+                            self._pos_timer.start()
                     return cb
 
-                def _make_stop_cb(p, btn):
+                def _make_stop_cb(e, btn):
                     def cb():
-                        p.stop()
+                        if e["player"] is None:
+                            return
+                        e["player"].stop()
                         btn.setText("▶ Play")
+                        self._show_position(e, 0)
                     return cb
 
-                def _make_pos_cb(sl, lbl, p):
-                    def cb(pos):
-                        if not sl.isSliderDown():
-                            sl.setValue(pos)
-                        dur = p.duration()
-                        ps, ds = pos // 1000, dur // 1000
-                        lbl.setText(f"{ps//60}:{ps%60:02d} / {ds//60}:{ds%60:02d}")
-                    return cb
-
-                def _make_dur_cb(sl):
-                    def cb(dur):
-                        sl.setRange(0, dur)
-                    return cb
-
-                def _make_seek_cb(p):
+                def _make_seek_cb(e):
                     def cb(val):
-                        p.setPosition(val)
+                        if e["player"] is None:
+                            return
+                        e["player"].setPosition(val)
+                        self._show_position(e, val)
                     return cb
 
-                btn_play.clicked.connect(_make_play_cb(player, btn_play))
-                btn_stop.clicked.connect(_make_stop_cb(player, btn_play))
-                player.positionChanged.connect(_make_pos_cb(slider, pos_lbl, player))
-                player.durationChanged.connect(_make_dur_cb(slider))
-                slider.sliderMoved.connect(_make_seek_cb(player))
+                btn_play.clicked.connect(_make_play_cb(entry, btn_play))
+                btn_stop.clicked.connect(_make_stop_cb(entry, btn_play))
+                slider.sliderMoved.connect(_make_seek_cb(entry))
 
                 ctrl_row.addWidget(btn_play)
                 ctrl_row.addWidget(btn_stop)
@@ -484,11 +1158,11 @@ class ReportDialog(QDialog):
 
             elif not file_path.exists():
                 warn = QLabel(f"Archivo no encontrado: {file_path}")
-                warn.setStyleSheet("color: #f04747; font-size: 11px;")
+                warn.setObjectName("error")
                 card_v.addWidget(warn)
             else:
                 warn = QLabel("Reproducción no disponible (PySide6.QtMultimedia no encontrado).")
-                warn.setStyleSheet("color: #72767d; font-size: 11px;")
+                warn.setObjectName("mutedSmall")
                 card_v.addWidget(warn)
 
             outer.addWidget(card)
@@ -499,11 +1173,7 @@ class ReportDialog(QDialog):
         segs = list(self._audio_segments)
         exp_btn = QPushButton("📁 Exportar audio(s) a carpeta…")
         exp_btn.setFixedHeight(36)
-        exp_btn.setStyleSheet(
-            "QPushButton { background: #7289da; color: white; border-radius: 6px; "
-            "font-size: 13px; padding: 0 16px; }"
-            "QPushButton:hover { background: #677bc4; }"
-        )
+        exp_btn.setObjectName("export")
         exp_btn.clicked.connect(lambda: self._export_files(
             [s["file_path"] for s in segs], "audio"
         ))
@@ -511,11 +1181,89 @@ class ReportDialog(QDialog):
 
         return w
 
+    @staticmethod
+    def _ensure_player(entry: dict):
+        """Crear el QMediaPlayer del audio en el primer Play (abrir/demuxear cuesta)."""
+        if entry["player"] is None:
+            player = QMediaPlayer()
+            audio_out = QAudioOutput()
+            audio_out.setVolume(1.0)
+            player.setAudioOutput(audio_out)
+            player.setSource(QUrl.fromLocalFile(os.fspath(entry["path"])))
+            slider = entry["slider"]
+            player.durationChanged.connect(lambda dur: slider.setRange(0, dur))
+            entry["player"], entry["audio_out"] = player, audio_out
+        return entry["player"]
+
+    @staticmethod
+    def _show_position(entry: dict, pos: int):
+        """Actualizar slider + etiqueta "m:ss / m:ss" de un reproductor."""
+        player, slider, pos_lbl = entry["player"], entry["slider"], entry["pos_lbl"]
+        if not slider.isSliderDown():
+            slider.setValue(pos)
+        ps, ds = pos // 1000, player.duration() // 1000
+        pos_lbl.setText(f"{ps//60}:{ps%60:02d} / {ds//60}:{ds%60:02d}")
+
+    def _update_positions(self):
+        """Tick del timer: refrescar solo los reproductores que están sonando."""
+        playing = False
+        for entry in self._players:
+            player = entry["player"]
+            if player is not None and \
+                    player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
+                playing = True
+                self._show_position(entry, player.position())
+        if not playing:
+            self._pos_timer.stop()
+
+    def _emotion_bars_pixmap(self, rows: list, total: int) -> QPixmap:
+        """Pinta con QPainter las filas (emoción, conteo): nombre, barra y porcentaje."""
+        ROW_H, BAR_H = 28, 18
+        NAME_W, BAR_W, PCT_W = 120, 420, 110
+        width, height = NAME_W + BAR_W + 8 + PCT_W, len(rows) * ROW_H
+
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(int(width * dpr), int(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(QColor("#2f3136"))
+
+        name_font = QFont()
+        name_font.setPixelSize(13)
+        pct_font = QFont()
+        pct_font.setPixelSize(12)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        for i, (emotion, count) in enumerate(rows):
+            y     = i * ROW_H
+            bar_y = y + (ROW_H - BAR_H) // 2
+            pct   = (count / total) * 100
+            emoji = EMOTION_EMOJIS.get(emotion, "❓")
+
+            painter.setFont(name_font)
+            painter.setPen(QColor("#dcddde"))
+            painter.drawText(QRect(0, y, NAME_W, ROW_H), Qt.AlignLeft | Qt.AlignVCenter,
+                             f"{emoji}  {emotion}")
+
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#40444b"))
+            painter.drawRoundedRect(QRect(NAME_W, bar_y, BAR_W, BAR_H), 4, 4)
+            painter.setBrush(QColor("#7289da"))
+            painter.drawRoundedRect(
+                QRect(NAME_W, bar_y, max(2, int(BAR_W * pct / 100)), BAR_H), 4, 4
+            )
+
+            painter.setFont(pct_font)
+            painter.setPen(QColor("#72767d"))
+            painter.drawText(QRect(NAME_W + BAR_W + 8, y, PCT_W, ROW_H),
+                             Qt.AlignLeft | Qt.AlignVCenter, f"{pct:.1f}%  ({count})")
+        painter.end()
+        return pixmap
+
     # ── Exportación genérica ──────────────────────────────────────────────────
 
     def _export_files(self, file_paths: list, kind: str = "archivos"):
         """Copia una lista de archivos a una carpeta elegida por el usuario."""
-        import shutil
         folder = QFileDialog.getExistingDirectory(
             self, f"Seleccionar carpeta de destino para {kind}", str(Path.home())
         )
@@ -535,185 +1283,115 @@ class ReportDialog(QDialog):
             msg += f"\n\n({missing} archivo(s) no encontrado(s))"
         QMessageBox.information(self, "Exportación completada", msg)
 
-    def _build_emotions_tab(self, session_id: int, db: Database) -> QWidget:
+    def _build_emotions_tab(self) -> QWidget:
         w = QWidget()
-        w.setStyleSheet("background: #2f3136;")
+        w.setObjectName("page")
         v = QVBoxLayout(w)
         v.setContentsMargins(20, 20, 20, 20)
         v.setSpacing(8)
 
         emotions = self._emotions
-        if not emotions:
+        if not len(emotions):
             lbl = QLabel("Sin datos de emoción en esta sesión.")
-            lbl.setStyleSheet("color: #72767d; font-size: 13px;")
+            lbl.setObjectName("muted")
             v.addWidget(lbl, alignment=Qt.AlignCenter)
             return w
 
-        summary = db.get_dominant_emotions_summary(session_id)
+        # Conteo en C sobre los códigos uint8 (sin otra consulta a SQLite)
+        codes = emotions["dominant"]
+        vals, cnts = np.unique(codes, return_counts=True)
+        order   = np.argsort(-cnts, kind="stable")
+        summary = [(EMOTION_LABELS[vals[i]], int(cnts[i])) for i in order]
         total   = len(emotions)
 
         title = QLabel("Distribución de emociones dominantes (sesión completa)")
-        title.setStyleSheet("color: #dcddde; font-size: 13px; font-weight: bold;")
+        title.setObjectName("heading")
         v.addWidget(title)
 
-        BAR_W = 420
-        for emotion, count in sorted(summary.items(), key=lambda x: x[1], reverse=True):
-            pct   = (count / total) * 100
-            emoji = EMOTION_EMOJIS.get(emotion, "❓")
-            row   = QHBoxLayout()
-
-            name_lbl = QLabel(f"{emoji}  {emotion}")
-            name_lbl.setStyleSheet("color: #dcddde; font-size: 13px; min-width: 110px;")
-            row.addWidget(name_lbl)
-
-            bar_bg = QFrame()
-            bar_bg.setStyleSheet("background: #40444b; border-radius: 4px;")
-            bar_bg.setFixedHeight(18)
-            bar_bg.setFixedWidth(BAR_W)
-            bar_fill = QFrame(bar_bg)
-            bar_fill.setFixedHeight(18)
-            bar_fill.setFixedWidth(max(2, int(BAR_W * pct / 100)))
-            bar_fill.setStyleSheet("background: #7289da; border-radius: 4px;")
-            row.addWidget(bar_bg)
-
-            pct_lbl = QLabel(f"{pct:.1f}%  ({count})")
-            pct_lbl.setStyleSheet("color: #72767d; font-size: 12px; min-width: 90px;")
-            row.addWidget(pct_lbl)
-
-            row.addStretch()
-            v.addLayout(row)
+        # Todas las barras pintadas en un único pixmap (un solo QLabel)
+        bars = QLabel()
+        bars.setPixmap(self._emotion_bars_pixmap(summary, total))
+        v.addWidget(bars)
 
         v.addSpacing(16)
         task_title = QLabel("Emoción dominante por tarea")
-        task_title.setStyleSheet("color: #dcddde; font-size: 13px; font-weight: bold;")
+        task_title.setObjectName("heading")
         v.addWidget(task_title)
 
+        task_ids = emotions["task_id"]
         for task_id, task_name in TASKS.items():
-            task_emotions = [e for e in emotions if e.get("task_id") == task_id]
-            if not task_emotions:
+            task_codes = codes[task_ids == task_id]
+            if not len(task_codes):
                 continue
-            task_summary: dict[str, int] = {}
-            for e in task_emotions:
-                d = e["dominant_emotion"]
-                task_summary[d] = task_summary.get(d, 0) + 1
-            top   = max(task_summary, key=task_summary.get)
+            vals, cnts = np.unique(task_codes, return_counts=True)
+            top   = EMOTION_LABELS[vals[cnts.argmax()]]
             emoji = EMOTION_EMOJIS.get(top, "❓")
             lbl   = QLabel(f"T{task_id}: {task_name}  →  {emoji} {top}")
-            lbl.setStyleSheet("color: #b9ffa0; font-size: 12px;")
+            lbl.setObjectName("taskTop")
             v.addWidget(lbl)
 
         v.addStretch()
         return w
 
-    # ── Generación de overlays con PIL (sin matplotlib) ───────────────────────
-
-    @staticmethod
-    def _make_overlay_pixmap(screenshot_info: dict, mouse_events: list):
-        """
-        Genera en memoria un overlay de heatmap + clicks sobre el screenshot.
-        Usa PIL + scipy para rapidez, sin necesidad de matplotlib.
-        Devuelve un QPixmap o None si hay error.
-        """
-        try:
-            import numpy as np
-            from PIL import Image, ImageDraw
-            from scipy.ndimage import gaussian_filter
-            from io import BytesIO
-
-            path = Path(screenshot_info["file_path"])
-            if not path.exists():
-                return None
-
-            img    = Image.open(path).convert("RGB")
-            img_w, img_h = img.size
-
-            # Dimensiones lógicas de pantalla (coordenadas de pynput)
-            SCREEN_W = screenshot_info.get("width")  or img_w
-            SCREEN_H = screenshot_info.get("height") or img_h
 
-            # ── Heatmap de movimientos ─────────────────────────────────────────
-            hm     = np.zeros((SCREEN_H, SCREEN_W), dtype=np.float32)
-            clicks = []
-
-            for e in mouse_events:
-                ex = max(0, min(int(e["x"]), SCREEN_W - 1))
-                ey = max(0, min(int(e["y"]), SCREEN_H - 1))
-                if e["event_type"] in ("move", "click"):
-                    hm[ey, ex] += 1.0
-                if e["event_type"] == "click" and e.get("pressed"):
-                    clicks.append((e["x"], e["y"]))
-
-            hm = gaussian_filter(hm, sigma=25)
-            if hm.max() > 0:
-                hm /= hm.max()
-
-            # Escalar heatmap al tamaño real del screenshot
-            hm_pil    = Image.fromarray((hm * 255).astype(np.uint8)).resize(
-                (img_w, img_h), Image.LANCZOS
-            )
-            hm_scaled = np.array(hm_pil).astype(np.float32) / 255.0
+# ── Ventana principal ─────────────────────────────────────────────────────────
 
-            # Colormap jet-like: azul → cian → verde → amarillo → rojo
-            r_ch = np.clip(hm_scaled * 2.0 - 0.0, 0, 1)
-            g_ch = np.clip(1.0 - np.abs(hm_scaled * 2.0 - 1.0), 0, 1)
-            b_ch = np.clip(1.0 - hm_scaled * 2.0, 0, 1)
-            a_ch = (hm_scaled * 170).astype(np.uint8)
+# Hoja de estilo única del panel inferior (un solo polish; selectores por objectName).
+# Los estados (grabando / guardada) son propiedades dinámicas, no hojas nuevas.
+_PANEL_QSS = """
+QFrame#BottomPanel { background: #1e2124; border-top: 2px solid #36393f; }
+QFrame#vline { color: #40444b; }
+
+QLabel#fieldLabel, QLabel#fieldLabelTop { color: #72767d; font-size: 11px; font-weight: bold; }
+QLabel#fieldLabelTop { margin-top: 3px; }
+QLabel#currentTask {
+    color: #b9ffa0; font-size: 12px; font-weight: bold;
+    background: #2f3136; border-radius: 4px; padding: 4px 8px;
+}
 
-            hm_rgba = np.stack([
-                (r_ch * 255).astype(np.uint8),
-                (g_ch * 255).astype(np.uint8),
-                (b_ch * 255).astype(np.uint8),
-                a_ch,
-            ], axis=-1)
+QLineEdit#participant {
+    background: #2f3136; color: #dcddde; border: 1px solid #40444b;
+    border-radius: 4px; padding: 4px 8px; font-size: 13px;
+}
+QLineEdit#participant:focus { border: 1px solid #7289da; }
 
-            overlay_layer = Image.fromarray(hm_rgba, "RGBA")
-            result        = Image.alpha_composite(img.convert("RGBA"), overlay_layer)
+QPlainTextEdit#log {
+    background: #2f3136; color: #b9ffa0; font-family: Consolas, monospace;
+    font-size: 12px; border: 1px solid #40444b; border-radius: 4px; padding: 4px;
+}
 
-            # ── Marcadores de clicks ───────────────────────────────────────────
-            if clicks:
-                draw = ImageDraw.Draw(result)
-                sx   = img_w / SCREEN_W
-                sy   = img_h / SCREEN_H
+QLabel#status { color: #72767d; font-weight: bold; font-size: 13px; }
+QLabel#status[state="recording"] { color: #f04747; }
+QLabel#status[state="saved"] { color: #43b581; }
 
-                for cx, cy in clicks:
-                    px  = int(cx * sx)
-                    py  = int(cy * sy)
-                    r   = max(10, int(16 * min(sx, sy)))
-
-                    # Anillo blanco exterior (visibilidad)
-                    draw.ellipse(
-                        [px - r - 3, py - r - 3, px + r + 3, py + r + 3],
-                        outline=(255, 255, 255, 200), width=3,
-                    )
-                    # Círculo rojo semi-transparente
-                    draw.ellipse(
-                        [px - r, py - r, px + r, py + r],
-                        outline=(220, 50, 50, 255),
-                        fill=(220, 50, 50, 140),
-                        width=2,
-                    )
-                    # Punto central blanco
-                    draw.ellipse(
-                        [px - 4, py - 4, px + 4, py + 4],
-                        fill=(255, 255, 255, 255),
-                    )
+QFrame#metric { background: #2f3136; border-radius: 6px; }
+QLabel#metricValue { color: #ffffff; font-size: 14px; font-weight: bold; }
+QLabel#metricLabel { color: #72767d; font-size: 10px; }
 
-            # ── Convertir a QPixmap ───────────────────────────────────────────
-            buf = BytesIO()
-            result.convert("RGB").save(buf, format="PNG")
-            buf.seek(0)
-            pixmap = QPixmap()
-            pixmap.loadFromData(buf.getvalue())
-            return pixmap
+QPushButton#toggle {
+    background: #43b581; color: white; font-weight: bold;
+    font-size: 14px; border-radius: 6px; padding: 0 20px;
+}
+QPushButton#toggle:hover { background: #3ca374; }
+QPushButton#toggle[recording="true"] { background: #f04747; }
+QPushButton#toggle[recording="true"]:hover { background: #d84040; }
 
-        except Exception as e:
-            print(f"Error generando overlay: {e}")
-            return None
+QPushButton#report {
+    background: #4f545c; color: #dcddde; border-radius: 6px;
+    font-size: 13px; padding: 0 16px;
+}
+QPushButton#report:enabled:hover { background: #5d6269; }
+QPushButton#report:disabled { color: #555; }
+"""
 
 
-# ── Ventana principal ─────────────────────────────────────────────────────────
 class HCILoggerWindow(QMainWindow):
 
+    # Plantilla HTML de cada línea del log (se formatea con str.format)
+    _LOG_TMPL = '<span style="color:#72767d">[{ts}] {msg}</span>'
+    # Líneas conservadas en el log; Qt descarta el bloque más antiguo al superar el tope
+    _LOG_MAX_BLOCKS = 5000
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("HCI Logger — Estudio Facebook")
@@ -723,8 +1401,10 @@ class HCILoggerWindow(QMainWindow):
 
         # Estado de sesión
         self.db              = Database()
+        self.db_writer       = None     # hilo escritor (una sesión a la vez)
         self.session_id      = None
         self.session_uuid    = None
+        self._uuid_short     = None     # primeros 8 hex del uuid, para mostrar
         self.current_task_id = 1
         self.is_recording    = False
         self.click_count     = 0
@@ -736,13 +1416,46 @@ class HCILoggerWindow(QMainWindow):
         self.emotion_tracker    = None
 
         self._last_heatmap_path = None   # ruta del heatmap de la sesión más reciente
-
-        # Buffer de mouse – NOTA: flush se extrae fuera del lock para evitar deadlock
-        self._event_buffer = []
-        self._buffer_lock  = threading.Lock()
+        self._report_bundle     = None   # datos del reporte, cargados al finalizar
+        self._overlays          = None   # OverlayCache de la galería (se precalcula)
+        # Raíz absoluta resuelta una sola vez: las rutas guardadas en la DB ya son absolutas
+        self._sessions_root = Path("data/sessions").resolve()
+        # Carpeta de salida (heatmaps, caché) creada una sola vez
+        self._output_dir = Path("output")
+        self._output_dir.mkdir(exist_ok=True)
+        self._session_ts_str = None      # "YYYYmmdd_HHMMSS" del inicio de sesión
+
+        # Buffer de mouse (filas listas para el escritor)
         self._BUFFER_SIZE  = 50
+        # Solo el hilo del listener agrega; el lock (sin contención en el camino
+        # normal) protege el flush final si el listener no terminó a tiempo
+        self._event_buffer = self._new_event_buffer()
+        self._buffer_lock  = threading.Lock()
+
+        self.screenshot_count = 0
+
+        # Contadores mostrados en la UI; el timer solo repinta si cambiaron
+        self._shown_clicks = 0
+        self._shown_shots  = 0
+        self._shown_emotion = "neutral"   # valor inicial de la tarjeta de emoción
+        self._current_emotion = "neutral" # la escribe el hilo del emotion tracker
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.setInterval(50)
+        self._metrics_timer.timeout.connect(self._refresh_metrics)
 
         self._stopping = False
+        self._starting = False   # arranque en curso en el QThreadPool
+
+        # (segundo epoch, "HH:MM:SS") — strftime solo una vez por segundo
+        self._ts_cache = (0, "")
+        # Líneas pendientes del log como (segundo epoch, mensaje): se formatean y
+        # vuelcan juntas cada 100 ms (o al volver a ser visible); con el panel
+        # oculto solo se conservan las más recientes
+        self._log_buffer = deque(maxlen=self._LOG_MAX_BLOCKS)
+        self._log_timer  = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
 
         self._build_ui()
         self._connect_signals()
@@ -757,6 +1470,9 @@ class HCILoggerWindow(QMainWindow):
         root.setContentsMargins(0, 0, 0, 0)
 
         self.browser = QWebEngineView()
+        # Overlays nativos sobre el browser: se ocultan al aparecer (sin polling).
+        # Antes de setPage/load para ver también los hijos que crean
+        self.browser.installEventFilter(self)
 
         # Usar página personalizada que suprime diálogos JS y permisos
         profile = QWebEngineProfile.defaultProfile()
@@ -802,6 +1518,13 @@ class HCILoggerWindow(QMainWindow):
         self.browser.loadFinished.connect(self._inject_modal_killer)
 
         self.browser.load(QUrl(TARGET_URL))
+        # Lo que setPage/load ya haya creado: focusProxy e hijos directos
+        for child in self.browser.children():
+            if child.isWidgetType():
+                self._watch_browser_child(child)
+        proxy = self.browser.focusProxy()
+        if proxy is not None:
+            proxy.installEventFilter(self)
         self.browser.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         root.addWidget(self.browser, stretch=1)
 
@@ -811,9 +1534,8 @@ class HCILoggerWindow(QMainWindow):
         panel = QFrame()
         panel.setFixedHeight(158)
         panel.setObjectName("BottomPanel")
-        panel.setStyleSheet(
-            "QFrame#BottomPanel { background: #1e2124; border-top: 2px solid #36393f; }"
-        )
+        # Sobre el panel y no sobre la ventana: el QWebEngineView queda fuera
+        panel.setStyleSheet(_PANEL_QSS)
 
         layout = QHBoxLayout(panel)
         layout.setContentsMargins(14, 10, 14, 10)
@@ -824,27 +1546,20 @@ class HCILoggerWindow(QMainWindow):
         col1.setSpacing(4)
 
         lbl_part = QLabel("Participante")
-        lbl_part.setStyleSheet("color: #72767d; font-size: 11px; font-weight: bold;")
+        lbl_part.setObjectName("fieldLabel")
         self.input_participant = QLineEdit()
+        self.input_participant.setObjectName("participant")
         self.input_participant.setPlaceholderText("ID o nombre…")
         self.input_participant.setFixedWidth(190)
-        self.input_participant.setStyleSheet(
-            "QLineEdit { background: #2f3136; color: #dcddde; border: 1px solid #40444b; "
-            "border-radius: 4px; padding: 4px 8px; font-size: 13px; }"
-            "QLineEdit:focus { border: 1px solid #7289da; }"
-        )
         col1.addWidget(lbl_part)
         col1.addWidget(self.input_participant)
 
         lbl_task = QLabel("Tarea")
-        lbl_task.setStyleSheet("color: #72767d; font-size: 11px; font-weight: bold; margin-top: 3px;")
+        lbl_task.setObjectName("fieldLabelTop")
         col1.addWidget(lbl_task)
 
         task_lbl = QLabel(f"T1: {TASKS[1]}")
-        task_lbl.setStyleSheet(
-            "color: #b9ffa0; font-size: 12px; font-weight: bold; "
-            "background: #2f3136; border-radius: 4px; padding: 4px 8px;"
-        )
+        task_lbl.setObjectName("currentTask")
         task_lbl.setWordWrap(True)
         col1.addWidget(task_lbl)
 
@@ -857,16 +1572,19 @@ class HCILoggerWindow(QMainWindow):
         col2.setSpacing(4)
 
         lbl_tr = QLabel("Estado / Log")
-        lbl_tr.setStyleSheet("color: #72767d; font-size: 11px; font-weight: bold;")
+        lbl_tr.setObjectName("fieldLabel")
         col2.addWidget(lbl_tr)
 
-        self.transcription_box = QTextEdit()
+        # QPlainTextEdit: documento solo de bloques, pensado para logs
+        self.transcription_box = LogView()
         self.transcription_box.setReadOnly(True)
-        self.transcription_box.setStyleSheet(
-            "QTextEdit { background: #2f3136; color: #b9ffa0; font-family: Consolas, monospace; "
-            "font-size: 12px; border: 1px solid #40444b; border-radius: 4px; padding: 4px; }"
-        )
+        self.transcription_box.setMaximumBlockCount(self._LOG_MAX_BLOCKS)
+        self.transcription_box.setObjectName("log")
         self.transcription_box.setPlaceholderText("Los eventos de sesión aparecerán aquí…")
+        self.transcription_box.shown.connect(self._flush_log)
+        # Cursor persistente al final del documento: inserción incremental de líneas
+        self._log_cursor = QTextCursor(self.transcription_box.document())
+        self._log_cursor.movePosition(QTextCursor.End)
         col2.addWidget(self.transcription_box, stretch=1)
 
         layout.addLayout(col2, stretch=1)
@@ -878,7 +1596,7 @@ class HCILoggerWindow(QMainWindow):
         col3.setAlignment(Qt.AlignTop)
 
         self.lbl_status = QLabel("● EN ESPERA")
-        self.lbl_status.setStyleSheet("color: #72767d; font-weight: bold; font-size: 13px;")
+        self.lbl_status.setObjectName("status")
         col3.addWidget(self.lbl_status)
 
         metrics_row = QHBoxLayout()
@@ -893,6 +1611,7 @@ class HCILoggerWindow(QMainWindow):
         col3.addStretch()
 
         self.btn_toggle = QPushButton("▶  Iniciar Sesión")
+        self.btn_toggle.setObjectName("toggle")
         self.btn_toggle.setFixedHeight(40)
         self.btn_toggle.setMinimumWidth(180)
         self._style_btn_start()
@@ -903,13 +1622,8 @@ class HCILoggerWindow(QMainWindow):
         self.btn_report = QPushButton("📊 Ver Análisis")
         self.btn_report.setFixedHeight(34)
         self.btn_report.setMinimumWidth(180)
+        self.btn_report.setObjectName("report")
         self.btn_report.setEnabled(False)
-        self.btn_report.setStyleSheet(
-            "QPushButton { background: #4f545c; color: #dcddde; border-radius: 6px; "
-            "font-size: 13px; padding: 0 16px; }"
-            "QPushButton:enabled:hover { background: #5d6269; }"
-            "QPushButton:disabled { color: #555; }"
-        )
         self.btn_report.clicked.connect(self._show_report)
         col3.addWidget(self.btn_report)
 
@@ -920,24 +1634,24 @@ class HCILoggerWindow(QMainWindow):
     def _vline() -> QFrame:
         f = QFrame()
         f.setFrameShape(QFrame.VLine)
-        f.setStyleSheet("color: #40444b;")
+        f.setObjectName("vline")
         return f
 
     @staticmethod
     def _make_metric(icon: str, value: str, label: str) -> QFrame:
         f = QFrame()
-        f.setStyleSheet("QFrame { background: #2f3136; border-radius: 6px; }")
+        f.setObjectName("metric")
         f.setFixedWidth(90)
         v = QVBoxLayout(f)
         v.setSpacing(0)
         v.setContentsMargins(6, 4, 6, 4)
 
         val_lbl = QLabel(f"{icon} {value}")
-        val_lbl.setStyleSheet("color: #ffffff; font-size: 14px; font-weight: bold;")
+        val_lbl.setObjectName("metricValue")
         val_lbl.setAlignment(Qt.AlignCenter)
 
         sub_lbl = QLabel(label)
-        sub_lbl.setStyleSheet("color: #72767d; font-size: 10px;")
+        sub_lbl.setObjectName("metricLabel")
         sub_lbl.setAlignment(Qt.AlignCenter)
 
         v.addWidget(val_lbl)
@@ -948,38 +1662,119 @@ class HCILoggerWindow(QMainWindow):
     # ── Señales → UI ──────────────────────────────────────────────────────────
 
     def _connect_signals(self):
-        self.signals.click_count_updated.connect(
-            lambda n: self.metric_clicks.value_label.setText(f"🖱 {n}")
-        )
-        self.signals.screenshot_count_updated.connect(
-            lambda n: self.metric_shots.value_label.setText(f"📸 {n}")
-        )
-        self.signals.emotion_updated.connect(self._display_emotion)
         self.signals.log_message.connect(self._append_log)
 
-    def _display_emotion(self, emotion: str):
-        emoji = EMOTION_EMOJIS.get(emotion, "😐")
-        self.metric_emotion.value_label.setText(f"{emoji} {emotion[:7]}")
+    def _refresh_metrics(self):
+        """Repintar las tres métricas (hilo GUI, cada 50 ms) solo si cambiaron.
+
+        Los trackers solo actualizan atributos; no hay una señal por métrica.
+        """
+        # setText ya agrupa sus repintados: cada etiqueta se repinta sola y solo si cambió
+        clicks  = self.click_count
+        shots   = self.screenshot_count
+        emotion = self._current_emotion
+        if clicks != self._shown_clicks:
+            self._shown_clicks = clicks
+            self.metric_clicks.value_label.setText(f"🖱 {clicks}")
+        if shots != self._shown_shots:
+            self._shown_shots = shots
+            self.metric_shots.value_label.setText(f"📸 {shots}")
+        if emotion != self._shown_emotion:
+            self._shown_emotion = emotion
+            emoji = EMOTION_EMOJIS.get(emotion, "😐")
+            self.metric_emotion.value_label.setText(f"{emoji} {emotion[:7]}")
+
+    def _ts(self, sec: int = None) -> str:
+        """HH:MM:SS del segundo epoch `sec` (o el actual); strftime solo al cambiar de segundo."""
+        if sec is None:
+            sec = int(time.time())
+        if self._ts_cache[0] != sec:
+            self._ts_cache = (sec, time.strftime("%H:%M:%S", time.localtime(sec)))
+        return self._ts_cache[1]
 
     def _append_log(self, msg: str):
-        ts = datetime.now().strftime("%H:%M:%S")
-        self.transcription_box.append(
-            f'<span style="color:#72767d">[{ts}] {msg}</span>'
-        )
+        # Solo el segundo entero: el formateo se hace una vez por tick en _flush_log
+        self._log_buffer.append((int(time.time()), msg))
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        """Formatear y volcar las líneas pendientes al widget en una sola edición."""
+        box = self.transcription_box
+        if not self._log_buffer:
+            return
+        if not box.isVisible():
+            # Panel oculto: sin trabajo de widget; LogView.shown lo vuelca al mostrarse
+            return
+        bar = box.verticalScrollBar()
+        at_bottom = bar.value() == bar.maximum()
+
+        # Un bloque por línea (el tope de bloques sigue contando líneas) y una
+        # sola pasada de layout para todo el lote
+        # En una ráfaga todas las líneas comparten segundo: un solo strftime
+        fmt, ts = self._LOG_TMPL.format, self._ts
+        cursor = self._log_cursor
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for sec, msg in self._log_buffer:
+            if not cursor.atStart():
+                cursor.insertBlock()
+            cursor.insertHtml(fmt(ts=ts(sec), msg=msg))
+        cursor.endEditBlock()
+        self._log_buffer.clear()
+
+        # Respetar la posición del usuario si subió a leer líneas anteriores
+        if at_bottom:
+            bar.setValue(bar.maximum())
 
     # ── Sesión ────────────────────────────────────────────────────────────────
 
     def toggle_session(self):
+        if self._starting:
+            return
         if not self.is_recording:
             self._start_session()
         else:
             self._stop_session()
 
     def _start_session(self):
+        """Pasar la UI a "Iniciando…" y delegar el arranque al QThreadPool."""
         participant = self.input_participant.text().strip() or "anonimo"
 
+        # Descartar los overlays de la sesión anterior (sus workers terminan solos)
+        if self._overlays is not None:
+            self._overlays.discard()
+        self._overlays      = None
+        _load_screenshot_rgba.cache_clear()
+        self._report_bundle = None
+
+        self._starting = True
+        self.input_participant.setEnabled(False)
+        self.btn_report.setEnabled(False)
+        self.btn_toggle.setEnabled(False)
+        self.btn_toggle.setText("⏳  Iniciando…")
+        self.lbl_status.setText("● INICIANDO")
+
+        # Forma canónica con guiones: es la que se guarda en la DB y nombra la carpeta
+        u = uuid.uuid4()
+        self.session_uuid = str(u)
+        self._uuid_short  = u.hex[:8]
+        self._session_ts_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._stopping = False
+        self.click_count = 0
+        self.screenshot_count = 0
+
+        starter = SessionStarter(lambda: self._do_start(participant), parent=self)
+        starter.signals.ready.connect(self._on_session_ready)
+        # Prioridad sobre overlays de la sesión anterior que sigan en cola
+        QThreadPool.globalInstance().start(starter, 1)
+
+    def _do_start(self, participant: str):
+        """Trabajo bloqueante del inicio (hilo del pool): DB, carpetas y hardware.
+
+        La UI no toca estos atributos hasta recibir ``ready``.
+        """
         self.db.initialize()
-        self.session_uuid = str(uuid.uuid4())
         self.session_id   = self.db.create_session(
             session_uuid=self.session_uuid,
             participant_id=participant,
@@ -989,15 +1784,16 @@ class HCILoggerWindow(QMainWindow):
             screen_height=1080,
         )
 
-        session_dir    = Path("data/sessions") / self.session_uuid
+        # Todas las inserciones de la sesión pasan por este hilo
+        self.db_writer = DatabaseWriter(self.db)
+        self.db_writer.start()
+
+        session_dir    = self._sessions_root / self.session_uuid
         screenshot_dir = session_dir / "screenshots"
         audio_dir      = session_dir / "audio"
         screenshot_dir.mkdir(parents=True, exist_ok=True)
         audio_dir.mkdir(parents=True, exist_ok=True)
 
-        self._stopping = False
-        self.click_count = 0
-
         # 1. Mouse
         self.mouse_tracker = MouseTracker(
             session_id=self.session_id,
@@ -1045,22 +1841,54 @@ class HCILoggerWindow(QMainWindow):
             self.signals.log_message.emit(f"⚠ Cámara no disponible: {e}")
             self.emotion_tracker = None
 
+    def _on_session_ready(self, error):
+        """Ya en el hilo de la UI: pasar a "grabando" (o volver a espera si falló)."""
+        self._starting = False
+        self.btn_toggle.setEnabled(True)
+        if error is not None:
+            self._abort_start()
+            self.signals.log_message.emit(f"⚠ No se pudo iniciar la sesión: {error}")
+            return
+
+        participant = self.input_participant.text().strip() or "anonimo"
         self.is_recording = True
-        self.input_participant.setEnabled(False)
+        self._metrics_timer.start()
         self._style_btn_stop()
         self.lbl_status.setText("● GRABANDO")
-        self.lbl_status.setStyleSheet("color: #f04747; font-weight: bold; font-size: 13px;")
+        self._set_style_state(self.lbl_status, "state", "recording")
         self.signals.log_message.emit(
-            f"Sesión iniciada — Participante: {participant} | ID: {self.session_uuid[:8]}…"
+            f"Sesión iniciada — Participante: {participant} | ID: {self._uuid_short}…"
         )
 
+    def _abort_start(self):
+        """Deshacer un arranque fallido: detener lo que llegó a iniciarse y volver a espera."""
+        for tracker in (self.mouse_tracker, self.screenshot_tracker,
+                        self.audio_tracker, self.emotion_tracker):
+            if tracker:
+                try:
+                    tracker.stop()
+                except Exception as e:
+                    logger.debug("Error deteniendo tracker tras fallo de inicio: %s", e)
+        self.mouse_tracker = self.screenshot_tracker = None
+        self.audio_tracker = self.emotion_tracker = None
+        if self.db_writer:
+            self.db_writer.stop()
+            self.db_writer = None
+        self.db.close()
+        self.session_id = None
+
+        self.input_participant.setEnabled(True)
+        self._style_btn_start()
+        self.lbl_status.setText("● EN ESPERA")
+        self._set_style_state(self.lbl_status, "state", "")
+
     def _stop_session(self):
         self.is_recording  = False
         self._stopping     = True
 
         # Detener trackers
-        if self.mouse_tracker:
-            self.mouse_tracker.stop()
+        if self.mouse_tracker and not self.mouse_tracker.stop():
+            logger.warning("El listener de mouse no terminó; se descartan sus eventos tardíos")
         if self.screenshot_tracker:
             self.screenshot_tracker.stop()
         if self.audio_tracker:
@@ -1068,271 +1896,357 @@ class HCILoggerWindow(QMainWindow):
         if self.emotion_tracker:
             self.emotion_tracker.stop()
 
-        # Flush final del buffer de mouse
+        # Flush final del buffer de mouse y escritura de todo lo encolado
         self._flush_buffer_safe()
+        writes_done = True
+        write_warning = None
+        if self.db_writer:
+            writes_done = self.db_writer.stop()
+            if self.db_writer.error is not None:
+                write_warning = "⚠ El escritor no pudo abrir la base de datos; la sesión no se guardó (ver log)"
+            elif self.db_writer.failed_rows:
+                write_warning = (f"⚠ {self.db_writer.failed_rows} registros de la sesión "
+                                 f"no se pudieron guardar (ver log)")
+            self.db_writer = None
+
+        self._metrics_timer.stop()
+        self._refresh_metrics()
 
         if self.session_id:
             self.db.end_session(self.session_id)
 
-        self._generate_heatmaps()
+        if write_warning:
+            self.signals.log_message.emit(write_warning)
+        if writes_done:
+            if self.session_id:
+                self._precompute_report()
+            self._generate_heatmaps()
+        else:
+            # El escritor sigue volcando filas: no precalcular sobre datos parciales;
+            # el reporte se cargará al abrirlo
+            self.signals.log_message.emit(
+                "⚠ La escritura de la sesión sigue en curso; el análisis puede tardar"
+            )
+            self.btn_report.setEnabled(True)
         self.db.close()
 
         # Restaurar UI
         self.input_participant.setEnabled(True)
         self._style_btn_start()
-        self.btn_report.setEnabled(True)
         self.lbl_status.setText("● SESIÓN GUARDADA")
-        self.lbl_status.setStyleSheet("color: #43b581; font-weight: bold; font-size: 13px;")
+        self._set_style_state(self.lbl_status, "state", "saved")
         self.signals.log_message.emit(
             f"Sesión guardada → data/sessions/{self.session_uuid}/"
         )
+        self._log_timer.stop()
+        self._flush_log()
 
     # ── Callbacks de trackers ─────────────────────────────────────────────────
 
     def _on_mouse_event(self, event: dict):
-        # ── IMPORTANTE: extraer el batch FUERA del lock para evitar deadlock ──
-        # (threading.Lock no es reentrante; _flush_buffer_safe también adquiere el lock)
-        batch_to_write = None
+        # Una sola extracción en C; el conteo de clicks reutiliza la tupla
+        row = _mouse_row(event)
+        batch = None
         with self._buffer_lock:
-            self._event_buffer.append((
-                event["session_id"],
-                event["timestamp"],
-                event["event_type"],
-                event["x"],
-                event["y"],
-                event["button"],
-                event["pressed"],
-                event["scroll_dx"],
-                event["scroll_dy"],
-                self.current_task_id,
-            ))
-            if len(self._event_buffer) >= self._BUFFER_SIZE:
-                batch_to_write = list(self._event_buffer)
-                self._event_buffer.clear()
-
-        # Flush fuera del lock
-        if batch_to_write and self.session_id:
-            self.db.insert_mouse_events_batch(batch_to_write)
+            buf = self._event_buffer
+            buf.append(row + (self.current_task_id,))
+            if len(buf) >= self._BUFFER_SIZE:
+                # Intercambiar el buffer en vez de copiarlo y vaciarlo
+                self._event_buffer = self._new_event_buffer()
+                batch = buf
+
+        # Encolar fuera del lock (el hilo escritor hace el INSERT)
+        writer = self.db_writer
+        if batch and writer and self.session_id:
+            writer.put("mouse", batch)
 
         # Alimentar screenshot tracker
         if self.screenshot_tracker:
             self.screenshot_tracker.on_mouse_event(event)
 
-        # Contar clicks
-        if event["event_type"] == "click" and event.get("pressed"):
+        # Contar clicks (row[2] = event_type, row[6] = pressed)
+        if row[2] == "click" and row[6]:
             self.click_count += 1
-            self.signals.click_count_updated.emit(self.click_count)
 
     def _on_screenshot(self, info: dict):
-        self.db.insert_screenshot(
-            session_id=info["session_id"],
-            timestamp=info["timestamp"],
-            file_path=info["file_path"],
-            file_size=info["file_size"],
-            width=info["width"],
-            height=info["height"],
-            format=info["format"],
-            trigger_event_type=info.get("trigger_event_type"),
-            trigger_x=info.get("trigger_x"),
-            trigger_y=info.get("trigger_y"),
-            task_id=self.current_task_id,
-        )
-        count = self.db.get_screenshot_count(self.session_id)
-        self.signals.screenshot_count_updated.emit(count)
+        self.db_writer.put("screenshot", [(
+            info["session_id"],
+            info["timestamp"],
+            info["file_path"],
+            info["file_size"],
+            info["width"],
+            info["height"],
+            info["format"],
+            info.get("trigger_event_type"),
+            info.get("trigger_x"),
+            info.get("trigger_y"),
+            None,                       # trigger_metadata
+            self.current_task_id,
+        )])
+        self.screenshot_count += 1
 
     def _on_audio_segment(self, segment: dict):
-        self.db.insert_audio_segment(
-            session_id=segment["session_id"],
-            start_timestamp=segment["start_timestamp"],
-            end_timestamp=segment["end_timestamp"],
-            duration=segment["duration"],
-            file_path=segment["file_path"],
-            sample_rate=segment["sample_rate"],
-            channels=segment["channels"],
-            file_size=segment["file_size"],
-            task_id=self.current_task_id,
-        )
+        self.db_writer.put("audio", [_audio_row(segment) + (self.current_task_id,)])
         dur_min = segment["duration"] / 60
         self.signals.log_message.emit(
             f"Audio guardado → {segment['file_path']}  ({dur_min:.1f} min)"
         )
 
     def _on_emotion(self, data: dict):
-        self.db.insert_emotion_event(
-            session_id=data["session_id"],
-            timestamp=data["timestamp"],
-            angry=data["angry"],
-            disgust=data["disgust"],
-            fear=data["fear"],
-            happy=data["happy"],
-            sad=data["sad"],
-            surprise=data["surprise"],
-            neutral=data["neutral"],
-            dominant_emotion=data["dominant_emotion"],
-            face_confidence=data.get("face_confidence"),
-            age=data.get("age"),
-            gender=data.get("gender"),
-            task_id=self.current_task_id,
-        )
-        self.signals.emotion_updated.emit(data["dominant_emotion"])
+        # Un thread que no terminó a tiempo en stop() puede llegar con el escritor ya cerrado
+        writer = self.db_writer
+        if writer:
+            writer.put("emotion", [_emotion_row(data) + (self.current_task_id,)])
+        # Asignación atómica; _refresh_metrics la muestra en el próximo tick
+        self._current_emotion = data["dominant_emotion"]
 
     # ── Helpers ───────────────────────────────────────────────────────────────
 
     def _inject_modal_killer(self, ok: bool):
         """Inyecta JS que cierra automáticamente modales/diálogos de Facebook
-        (ej: 'Recordar contraseña') y oculta widgets nativos de Qt."""
+        (ej: 'Recordar contraseña'). Los widgets nativos de Qt los oculta eventFilter."""
+        # Una pasada por carga: overlays anidados que se crearon junto con su
+        # contenedor antes de que eventFilter pudiera verlos
+        self._sweep_overlays()
         if not ok:
             return
 
-        # ── 1. Ocultar widgets hijos nativos que Qt pone sobre el browser ────
-        self._hide_native_overlays()
-
         js = """
         (function() {
-            // Cerrar modales de Facebook
-            function killModals() {
+            if (window.__hciModalObserver) return;   // ya instalado en esta página
+
+            var DISMISS = ['Ahora no', 'Not Now', 'Not now', 'Dismiss', 'Descartar'];
+            var CLOSERS = '[aria-label="Cerrar"], [aria-label="Close"], [aria-label="Dismiss"]';
+            var BACKDROPS = '[data-testid="dialog_overlay"], ' +
+                            '.__fb-dark-mode-compatible-background-overlay';
+
+            // querySelectorAll sobre `root` incluyendo al propio root
+            function scoped(root, selector) {
+                var found = Array.prototype.slice.call(root.querySelectorAll(selector));
+                if (root.matches && root.matches(selector)) found.unshift(root);
+                return found;
+            }
+
+            // Cerrar modales de Facebook dentro de `root` (solo lo nuevo, no todo el DOM)
+            function killModals(root) {
                 // Buscar botones "Ahora no" / "Not Now"
-                var buttons = document.querySelectorAll('[role="button"], button, a, span');
+                var buttons = scoped(root, '[role="button"], button, a, span');
                 for (var i = 0; i < buttons.length; i++) {
                     var text = (buttons[i].textContent || '').trim();
-                    if (text === 'Ahora no' || text === 'Not Now' || text === 'Not now' ||
-                        text === 'Dismiss' || text === 'Descartar') {
+                    if (DISMISS.indexOf(text) !== -1) {
                         buttons[i].click();
                         return;
                     }
                 }
-                // Cerrar diálogos via aria-label
-                var closers = document.querySelectorAll(
-                    '[aria-label="Cerrar"], [aria-label="Close"], [aria-label="Dismiss"]'
-                );
+                // Cerrar diálogos via aria-label (solo si están dentro de un diálogo)
+                var closers = scoped(root, CLOSERS);
                 for (var j = 0; j < closers.length; j++) {
-                    // Solo si el diálogo está visible
-                    var parent = closers[j].closest('[role="dialog"]');
-                    if (parent) {
+                    if (closers[j].closest('[role="dialog"]')) {
                         closers[j].click();
                         return;
                     }
                 }
                 // Remover overlays/backdrops que oscurecen la página
-                var overlays = document.querySelectorAll(
-                    '[data-testid="dialog_overlay"], .__fb-dark-mode-compatible-background-overlay'
-                );
-                overlays.forEach(function(el) { el.remove(); });
+                scoped(root, BACKDROPS).forEach(function(el) { el.remove(); });
             }
-            // Ejecutar cada 1.5 segundos durante 60 segundos
-            var count = 0;
-            var iv = setInterval(function() {
-                killModals();
-                count++;
-                if (count > 40) clearInterval(iv);
-            }, 1500);
-            killModals();
+
+            // Reaccionar solo a nodos agregados, durante los primeros 60 segundos
+            var observer = new MutationObserver(function(mutations) {
+                for (var m = 0; m < mutations.length; m++) {
+                    var added = mutations[m].addedNodes;
+                    for (var n = 0; n < added.length; n++) {
+                        if (added[n].nodeType === 1 && added[n].isConnected) {
+                            killModals(added[n]);
+                        }
+                    }
+                }
+            });
+            observer.observe(document.documentElement, {childList: true, subtree: true});
+            window.__hciModalObserver = observer;
+            setTimeout(function() { observer.disconnect(); }, 60000);
+            killModals(document.documentElement);
         })();
         """
         self.browser.page().runJavaScript(js)
 
-    def _hide_native_overlays(self):
-        """Inicia un timer periódico que busca y oculta widgets nativos de Qt
-        que aparecen sobre el browser (como el botón 'Cerrar')."""
-        from PySide6.QtCore import QTimer
-        self._overlay_timer = QTimer(self)
-        self._overlay_timer.timeout.connect(self._scan_and_hide_overlays)
-        self._overlay_timer.start(500)  # Cada 500ms
-
-    def _scan_and_hide_overlays(self):
-        """Busca recursivamente en TODA la jerarquía del browser y elimina
-        cualquier widget nativo de overlay (botones, labels, frames)."""
-        from PySide6.QtWidgets import QWidget as QW, QPushButton as QPB
+    def eventFilter(self, obj, event):
+        """Ocultar widgets nativos de Qt (como el botón 'Cerrar') en cuanto aparecen.
+
+        Filtra el browser (instalado una vez en __init__) y los widgets del render
+        que se le agregan (focusProxy, recreado en cada carga), donde cuelgan los
+        overlays, y los contenedores que no son overlay dentro de ellos (ver
+        _watch_nested_child). Lo que ya estaba anidado al agregarse lo cubre
+        _sweep_overlays tras cada carga."""
+        # Solo se inspecciona el hijo nuevo: O(1) por widget agregado. En
+        # ChildAdded el hijo puede no estar construido del todo (className() aún
+        # dice QWidget); ChildPolished llega con la clase definitiva
+        etype = event.type()
+        if etype in (QEvent.ChildAdded, QEvent.ChildPolished):
+            child = event.child()
+            if child is not None and child.isWidgetType():
+                if obj is self.browser:
+                    self._watch_browser_child(child)
+                else:
+                    self._watch_nested_child(child)
+        return super().eventFilter(obj, event)
+
+    def _watch_nested_child(self, child):
+        """Hijo de un widget filtrado: ocultarlo si es overlay; si es un contenedor,
+        filtrarlo también (sus hijos futuros) y revisar los que ya trae."""
+        if self._hide_if_overlay(child) or _is_preserved_class(child.metaObject().className()):
+            return
+        child.installEventFilter(self)
+        for nested in child.findChildren(QWidget):
+            self._hide_if_overlay(nested)
+
+    def _sweep_overlays(self):
+        """Revisión única del árbol del browser (al terminar cada carga, no periódica)."""
+        removed = []
+        for child in self.browser.findChildren(QWidget):
+            # Los descendientes de un overlay ya eliminado se van con él
+            if any(r.isAncestorOf(child) for r in removed):
+                continue
+            if self._hide_if_overlay(child):
+                removed.append(child)
+
+    def _watch_browser_child(self, child):
+        """Ocultar `child` si es un overlay; si es un widget del render (o el
+        focusProxy), filtrar también sus hijos. installEventFilter es idempotente."""
+        if self._hide_if_overlay(child):
+            return
+        if (child is self.browser.focusProxy()
+                or _is_preserved_class(child.metaObject().className())):
+            child.installEventFilter(self)
+
+    def _hide_if_overlay(self, child) -> bool:
+        """Elimina `child` si es un overlay nativo. Devuelve True si lo eliminó."""
+        class_name = child.metaObject().className()
+
+        # Preservar widgets esenciales del render
+        if _is_preserved_class(class_name):
+            return False
+
+        # Si es un QPushButton → eliminar siempre (no debería haber botones en el browser)
+        if isinstance(child, QPushButton):
+            if logger.isEnabledFor(logging.DEBUG):
+                parent = child.parent()
+                logger.debug("overlay: eliminando QPushButton '%s' class=%s parent=%s",
+                             child.text(), class_name,
+                             parent.metaObject().className() if parent else None)
+            self._remove_overlay(child)
+            return True
+
+        # Buscar widgets con texto sospechoso
         try:
-            for child in self.browser.findChildren(QW):
-                class_name = child.metaObject().className()
-
-                # Preservar widgets esenciales del render
-                if any(x in class_name for x in [
-                    "RenderWidget", "WebEngineView", "QWebEngine",
-                    "FocusProxy", "QtWebEngineCore",
-                ]):
-                    continue
-
-                # Si es un QPushButton → eliminar siempre (no debería haber botones en el browser)
-                if isinstance(child, QPB):
-                    print(f"[DEBUG overlay] Eliminando QPushButton: '{child.text()}' "
-                          f"class={class_name} parent={child.parent().metaObject().className() if child.parent() else 'None'}")
-                    child.hide()
-                    child.setParent(None)
-                    child.deleteLater()
-                    continue
-
-                # Buscar widgets con texto sospechoso
-                try:
-                    if hasattr(child, 'text') and callable(child.text):
-                        text = child.text()
-                        if text in ("Cerrar", "Close", "Dismiss"):
-                            print(f"[DEBUG overlay] Eliminando widget con texto '{text}': "
-                                  f"class={class_name}")
-                            child.hide()
-                            child.setParent(None)
-                            child.deleteLater()
-                            continue
-                except Exception:
-                    pass
+            if hasattr(child, 'text') and callable(child.text):
+                text = child.text()
+                if text in ("Cerrar", "Close", "Dismiss"):
+                    logger.debug("overlay: eliminando widget con texto '%s' class=%s",
+                                 text, class_name)
+                    self._remove_overlay(child)
+                    return True
+        except Exception:
+            pass
+        return False
 
-        except Exception as e:
-            print(f"[DEBUG overlay] Error: {e}")
+    @staticmethod
+    def _remove_overlay(child):
+        child.hide()
+        child.setParent(None)
+        child.deleteLater()
+
+    def _new_event_buffer(self) -> deque:
+        """Buffer de mouse nuevo; se entrega al escritor al llegar a _BUFFER_SIZE.
+
+        No necesita tope propio: el intercambio lo mantiene en _BUFFER_SIZE filas
+        y la memoria ante un escritor atascado la acota la cola de DatabaseWriter.
+        """
+        return deque()
 
     def _flush_buffer_safe(self):
-        """Flush seguro del buffer (llamar SOLO desde fuera de _on_mouse_event)."""
+        """Flush final del buffer (llamar tras detener el mouse tracker).
+
+        Con el lock: si el listener no terminó, un callback tardío no puede
+        estar agregando al mismo buffer que se entrega al escritor.
+        """
         with self._buffer_lock:
-            if self._event_buffer and self.session_id:
-                self.db.insert_mouse_events_batch(self._event_buffer)
-                self._event_buffer.clear()
+            buf, self._event_buffer = self._event_buffer, self._new_event_buffer()
+        if buf and self.session_id and self.db_writer:
+            self.db_writer.put("mouse", buf)
 
     def _generate_heatmaps(self):
-        events = self.db.get_mouse_events(self.session_id)
-        if not events:
-            return
-        ts  = datetime.now().strftime("%Y%m%d_%H%M%S")
-        out = Path("output")
-        out.mkdir(exist_ok=True)
-        heatmap_file = out / f"heatmap_{ts}.png"
-        gen = HeatmapGenerator(screen_width=1920, screen_height=1080)
-        gen.generate_from_events(events, heatmap_file)
-        self._last_heatmap_path = heatmap_file
-        self.signals.log_message.emit(f"Heatmap → {heatmap_file}")
+        """Generar el heatmap en el QThreadPool; "Ver Análisis" se habilita al terminar."""
+        heatmap_file = self._output_dir / f"heatmap_{self._session_ts_str}.png"
+        worker = HeatmapWorker(self.db.db_path, self.session_id, heatmap_file, parent=self)
+        worker.signals.done.connect(self._on_heatmap_ready)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_heatmap_ready(self, session_id: int, heatmap_file):
+        if session_id != self.session_id or self.is_recording or self._starting:
+            return  # resultado de una sesión anterior
+        self._last_heatmap_path = heatmap_file   # None: la sesión no tuvo eventos
+        if heatmap_file is not None:
+            self.signals.log_message.emit(f"Heatmap → {heatmap_file}")
+        self.btn_report.setEnabled(True)
+
+    def _precompute_report(self):
+        """Cargar los datos del reporte en segundo plano (conexión propia)."""
+        loader = ReportLoader(self.db.db_path, self.session_id, parent=self)
+        loader.signals.loaded.connect(self._on_report_loaded)
+        QThreadPool.globalInstance().start(loader)
+
+    def _on_report_loaded(self, session_id: int, bundle: ReportBundle):
+        """Guardar los datos y generar los overlays de la galería en el QThreadPool."""
+        if session_id != self.session_id or self.is_recording or self._starting:
+            return  # resultado de una sesión anterior
+        self._report_bundle = bundle
+        self._overlays = OverlayCache(
+            self._report_bundle.screenshots,
+            OverlayRenderer(self._report_bundle.mouse_events),
+            ReportDialog.GALLERY_SIZE, self,
+        )
+        self._overlays.precompute()
 
     def _show_report(self):
         if self.session_id is None:
             return
         # Reabrir DB en modo lectura para el reporte
         report_db = Database()
-        report_db.initialize()
+        report_db.connect(read_only=True)
         dlg = ReportDialog(
             self.session_id, self.session_uuid, report_db,
             heatmap_path=self._last_heatmap_path,
+            bundle=self._report_bundle,
+            overlays=self._overlays,
             parent=self,
         )
         dlg.exec()
         report_db.close()
 
+    @staticmethod
+    def _set_style_state(widget: QWidget, name: str, value):
+        """Cambiar una propiedad usada por _PANEL_QSS y re-aplicar solo ese widget."""
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+
     def _style_btn_start(self):
         self.btn_toggle.setText("▶  Iniciar Sesión")
-        self.btn_toggle.setStyleSheet(
-            "QPushButton { background: #43b581; color: white; font-weight: bold; "
-            "font-size: 14px; border-radius: 6px; padding: 0 20px; }"
-            "QPushButton:hover { background: #3ca374; }"
-        )
+        self._set_style_state(self.btn_toggle, "recording", False)
 
     def _style_btn_stop(self):
         self.btn_toggle.setText("⏹  Finalizar Sesión")
-        self.btn_toggle.setStyleSheet(
-            "QPushButton { background: #f04747; color: white; font-weight: bold; "
-            "font-size: 14px; border-radius: 6px; padding: 0 20px; }"
-            "QPushButton:hover { background: #d84040; }"
-        )
+        self._set_style_state(self.btn_toggle, "recording", True)
 
     def closeEvent(self, event):
+        if self._starting:
+            event.ignore()   # los trackers aún se están encendiendo en otro hilo
+            return
         if self.is_recording:
             self._stop_session()
+        self._log_timer.stop()
+        self._flush_log()
         event.accept()
 
 
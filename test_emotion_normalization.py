@@ -3,15 +3,19 @@
 """Test de normalización de valores de emociones"""
 
 def normalize_emotion(value):
-    """Normaliza y clampea valor de emoción a rango [0, 1]"""
+    """Normaliza y clampea valor de emoción a rango [0, 1]
+
+    Copia de hci_logger.trackers.emotion_tracker.normalize_emotion (ese módulo
+    importa DeepFace y cv2, no disponibles en todos los entornos de test)
+    """
     try:
         if value is None:
             return 0.0
-        normalized = float(value) / 100.0
-        # Clampear al rango [0, 1] para cumplir con CHECK constraint
-        return max(0.0, min(1.0, normalized))
+        v = float(value) / 100.0
     except (ValueError, TypeError):
         return 0.0
+    # Clampear al rango [0, 1] para cumplir con CHECK constraint
+    return v if 0.0 <= v <= 1.0 else (0.0 if v < 0.0 else 1.0)
 
 
 def test_normalization():